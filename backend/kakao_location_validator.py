@@ -13,6 +13,8 @@ import re
 
 logger = logging.getLogger(__name__)
 
+_KAKAO_KEYWORD_URL = "https://dapi.kakao.com/v2/local/search/keyword.json"
+
 @dataclass
 class PlaceValidationResult:
     """장소 검증 결과를 담는 데이터 클래스"""
@@ -58,7 +60,7 @@ class KakaoLocationValidator:
         Returns:
             PlaceValidationResult: 검증 결과
         """
-        logger.info(f"장소 검증 시작: '{place_name}' (지역: {region})")
+        logger.info("장소 검증 시작: '%s' (지역: %s)", place_name, region)
         
         # API 키가 없으면 기본 검증 결과 반환
         if not self.api_key:
@@ -86,7 +88,7 @@ class KakaoLocationValidator:
             return local_result
             
         except Exception as e:
-            logger.error(f"카카오 API 장소 검증 중 오류 발생: {e}")
+            logger.error("카카오 API 장소 검증 중 오류 발생: %s", e)
             return PlaceValidationResult(
                 is_valid=False,
                 place_name=place_name,
@@ -95,24 +97,26 @@ class KakaoLocationValidator:
                 suggestion="카카오 API 호출 중 오류가 발생했습니다."
             )
     
+    def _kakao_keyword_documents(self, search_query: str, size: int) -> List[dict]:
+        """카카오 키워드 검색 API를 호출해 결과 문서 목록을 반환합니다 (로컬/키워드 검증 공용)"""
+        params = {
+            "query": search_query,
+            "size": size,
+            "page": 1,
+            "sort": "accuracy"
+        }
+        
+        response = requests.get(_KAKAO_KEYWORD_URL, headers=self.headers, params=params, timeout=10)
+        response.raise_for_status()
+        
+        return response.json().get('documents', [])
+    
     def _search_kakao_local(self, place_name: str, region: str = "") -> PlaceValidationResult:
         """카카오 로컬 검색 API로 장소 검증"""
         search_query = f"{region} {place_name}" if region else place_name
         
         try:
-            url = "https://dapi.kakao.com/v2/local/search/keyword.json"
-            params = {
-                "query": search_query,
-                "size": 5,
-                "page": 1,
-                "sort": "accuracy"
-            }
-            
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            documents = data.get('documents', [])
+            documents = self._kakao_keyword_documents(search_query, 5)
             
             if not documents:
                 return PlaceValidationResult(
@@ -148,7 +152,7 @@ class KakaoLocationValidator:
                 suggestion="카카오 로컬 검색 중 타임아웃이 발생했습니다."
             )
         except Exception as e:
-            logger.error(f"카카오 로컬 검색 오류: {e}")
+            logger.error("카카오 로컬 검색 오류: %s", e)
             return PlaceValidationResult(
                 is_valid=False,
                 place_name=place_name,
@@ -162,19 +166,7 @@ class KakaoLocationValidator:
         search_query = f"{region} {place_name} 관광지" if region else f"{place_name} 관광지"
         
         try:
-            url = "https://dapi.kakao.com/v2/local/search/keyword.json"
-            params = {
-                "query": search_query,
-                "size": 10,
-                "page": 1,
-                "sort": "accuracy"
-            }
-            
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            documents = data.get('documents', [])
+            documents = self._kakao_keyword_documents(search_query, 10)
             
             if not documents:
                 return PlaceValidationResult(
@@ -195,7 +187,7 @@ class KakaoLocationValidator:
             )
             
         except Exception as e:
-            logger.error(f"카카오 키워드 검색 오류: {e}")
+            logger.error("카카오 키워드 검색 오류: %s", e)
             return PlaceValidationResult(
                 is_valid=False,
                 place_name=place_name,
@@ -285,9 +277,10 @@ class KakaoLocationValidator:
                         'suggestion': result.suggestion
                     })
         
-        logger.info(f"일정 검증 완료: 총 {validation_summary['total_places']}개 장소 중 "
-                   f"{validation_summary['valid_places']}개 유효, "
-                   f"{validation_summary['invalid_places']}개 무효")
+        logger.info("일정 검증 완료: 총 %s개 장소 중 %s개 유효, %s개 무효",
+                   validation_summary['total_places'],
+                   validation_summary['valid_places'],
+                   validation_summary['invalid_places'])
         
         return validation_summary
     
@@ -415,5 +408,5 @@ class KakaoLocationValidator:
             return alternatives[:3] if alternatives else [f"{region} 지역의 관광지를 직접 검색해보세요."]
             
         except Exception as e:
-            logger.error(f"대안 제안 중 오류: {e}")
+            logger.error("대안 제안 중 오류: %s", e)
             return [f"{region} 지역의 대표 관광지를 검색해보세요."]
@@ -7,6 +7,10 @@ import urllib.parse
 
 logger = logging.getLogger(__name__)
 
+# 관련성 점수 계산에 쓰는 키워드 (호출마다 리스트를 새로 만들지 않도록 모듈 상수로 둡니다)
+_TOURISM_CATEGORY_KEYWORDS = ('관광', '명소', '문화', '체험', '공원', '박물관', '미술관', '케이블카', '전망대', '해상')
+_IRRELEVANT_NAME_KEYWORDS = ('정비', '수리', '부동산', '병원', '의원')
+
 class KakaoPlaceService:
     """카카오 로컬 API를 사용한 실제 장소 정보 서비스"""
     
@@ -59,11 +63,11 @@ class KakaoPlaceService:
                 }
                 places.append(place_info)
             
-            logger.info(f"장소 검색 완료: '{search_query}' -> {len(places)}개 결과")
+            logger.info("장소 검색 완료: '%s' -> %s개 결과", search_query, len(places))
             return places
             
         except Exception as e:
-            logger.error(f"장소 검색 오류: {e}")
+            logger.error("장소 검색 오류: %s", e)
             return []
     
     def get_detailed_address(self, place_name: str, region: str = "") -> Optional[str]:
@@ -85,7 +89,7 @@ class KakaoPlaceService:
         
         # 모호한 장소명 감지
         if self._is_vague_location(location) or self._is_vague_location(title):
-            logger.warning(f"모호한 장소명 감지: title='{title}', location='{location}' - 구체적인 장소명이 필요합니다")
+            logger.warning("모호한 장소명 감지: title='%s', location='%s' - 구체적인 장소명이 필요합니다", title, location)
             # 모호한 장소명인 경우 검색하지 않고 원본 그대로 반환 (부정확한 정보 방지)
             return activity
         
@@ -97,17 +101,17 @@ class KakaoPlaceService:
             self._extract_place_name_from_title(title)
         ]
         
-        logger.info(f"장소 검색 시작: title='{title}', location='{location}', region='{region}'")
+        logger.info("장소 검색 시작: title='%s', location='%s', region='%s'", title, location, region)
         
         for i, keyword in enumerate(search_keywords):
             if keyword and len(keyword.strip()) > 1:
-                logger.info(f"검색 키워드 {i+1}: '{keyword}'")
+                logger.info("검색 키워드 %s: '%s'", i+1, keyword)
                 places = self.search_places(keyword, region, display=5)  # 더 많은 결과 가져오기
                 
                 if places:
-                    logger.info(f"'{keyword}' 검색 결과 {len(places)}개:")
+                    logger.info("'%s' 검색 결과 %s개:", keyword, len(places))
                     for j, place in enumerate(places):
-                        logger.info(f"  {j+1}. {place['name']} - {place['category']} - {place['address']}")
+                        logger.info("  %s. %s - %s - %s", j+1, place['name'], place['category'], place['address'])
                     
                     # 관련성이 높은 장소 찾기
                     best_place = self._find_most_relevant_place(keyword, places)
@@ -131,13 +135,13 @@ class KakaoPlaceService:
                         if best_place['road_address'] or best_place['address']:
                             enhanced_activity['location'] = best_place['road_address'] or best_place['address']
                         
-                        logger.info(f"실제 장소 정보 추가: {keyword} -> {best_place['name']} ({best_place['address']})")
+                        logger.info("실제 장소 정보 추가: %s -> %s (%s)", keyword, best_place['name'], best_place['address'])
                         return enhanced_activity
                 else:
-                    logger.warning(f"'{keyword}' 검색 결과 없음")
+                    logger.warning("'%s' 검색 결과 없음", keyword)
         
         # 실제 장소를 찾지 못한 경우 원본 그대로 반환 (잘못된 정보 추가 방지)
-        logger.warning(f"신뢰할 만한 장소 정보를 찾지 못함: '{location}' - 부정확한 정보 추가를 방지하기 위해 원본 정보 유지")
+        logger.warning("신뢰할 만한 장소 정보를 찾지 못함: '%s' - 부정확한 정보 추가를 방지하기 위해 원본 정보 유지", location)
         return activity
     
     def enhance_itinerary_with_real_places(self, itinerary: List[Dict], destination: str) -> List[Dict]:
@@ -175,7 +179,7 @@ class KakaoPlaceService:
             '숙박', '모텔', '펜션', '게스트하우스', '호텔'
         ]
         
-        logger.info(f"장소 필터링 시작: 키워드='{keyword}', 총 {len(places)}개 결과")
+        logger.info("장소 필터링 시작: 키워드='%s', 총 %s개 결과", keyword, len(places))
         
         relevant_places = []
         
@@ -183,13 +187,13 @@ class KakaoPlaceService:
             place_name = place['name'].lower().replace(' ', '')
             place_category = place['category'].lower()
             
-            logger.info(f"  {i+1}. 검토: {place['name']} | 카테고리: {place['category']}")
+            logger.info("  %s. 검토: %s | 카테고리: %s", i+1, place['name'], place['category'])
             
             # 1. 관련 없는 카테고리 제외
             excluded = False
             for irrelevant in irrelevant_categories:
                 if irrelevant in place_category:
-                    logger.warning(f"     → 카테고리 제외: '{irrelevant}' 포함")
+                    logger.warning("     → 카테고리 제외: '%s' 포함", irrelevant)
                     excluded = True
                     break
             
@@ -200,7 +204,7 @@ class KakaoPlaceService:
             exact_match_score = self._calculate_exact_match_score(keyword_lower, place_name)
             
             if exact_match_score < 0.7:  # 70% 이상 일치해야 함
-                logger.warning(f"     → 이름 일치도 미달: {exact_match_score:.2f} (최소 0.7 필요)")
+                logger.warning("     → 이름 일치도 미달: %.2f (최소 0.7 필요)", exact_match_score)
                 continue
             
             # 3. 관련성 점수 계산
@@ -212,24 +216,24 @@ class KakaoPlaceService:
                 # enhance_activity_with_real_place 함수의 region 파라미터 사용
                 target_region = getattr(self, '_current_region', '') or keyword
                 if not self._validate_address_accuracy(place_address, target_region):
-                    logger.warning(f"     → 주소 행정구역 오류: {place_address} (지역: {target_region})")
+                    logger.warning("     → 주소 행정구역 오류: %s (지역: %s)", place_address, target_region)
                     continue
                 
                 place['relevance_score'] = relevance_score
                 place['exact_match_score'] = exact_match_score
                 relevant_places.append(place)
-                logger.info(f"     ✅ 통과: 관련성={relevance_score:.2f}, 정확도={exact_match_score:.2f}")
+                logger.info("     ✅ 통과: 관련성=%.2f, 정확도=%.2f", relevance_score, exact_match_score)
             else:
-                logger.warning(f"     → 관련성 미달: {relevance_score:.2f} (최소 0.7 필요)")
+                logger.warning("     → 관련성 미달: %.2f (최소 0.7 필요)", relevance_score)
         
         if relevant_places:
             # 정확도와 관련성 모두 고려하여 정렬
             relevant_places.sort(key=lambda x: (x['exact_match_score'], x['relevance_score']), reverse=True)
             best_place = relevant_places[0]
-            logger.info(f"✅ 최종 선택: {best_place['name']} (정확도: {best_place['exact_match_score']:.2f}, 관련성: {best_place['relevance_score']:.2f})")
+            logger.info("✅ 최종 선택: %s (정확도: %.2f, 관련성: %.2f)", best_place['name'], best_place['exact_match_score'], best_place['relevance_score'])
             return best_place
         
-        logger.error(f"❌ 조건을 만족하는 장소를 찾지 못함: '{keyword}' - 검색 결과가 부정확합니다")
+        logger.error("❌ 조건을 만족하는 장소를 찾지 못함: '%s' - 검색 결과가 부정확합니다", keyword)
         return None
     
     def _calculate_relevance_score(self, keyword: str, place_name: str, place_category: str) -> float:
@@ -238,56 +242,47 @@ class KakaoPlaceService:
         keyword_normalized = keyword.replace(' ', '').lower()
         place_normalized = place_name.replace(' ', '').lower()
         
-        logger.debug(f"관련성 계산: '{keyword_normalized}' vs '{place_normalized}'")
+        logger.debug("관련성 계산: '%s' vs '%s'", keyword_normalized, place_normalized)
         
         # 1. 정확한 이름 일치도 (가장 중요)
         if keyword_normalized in place_normalized:
             if keyword_normalized == place_normalized:
                 score += 1.0  # 완전 일치
-                logger.debug(f"완전 일치: +1.0")
+                logger.debug("완전 일치: +1.0")
             elif place_normalized.startswith(keyword_normalized):
                 score += 0.9  # 시작 부분 일치
-                logger.debug(f"시작 일치: +0.9")
+                logger.debug("시작 일치: +0.9")
             else:
                 # 키워드가 장소명에 포함되는 비율 계산
                 ratio = len(keyword_normalized) / len(place_normalized)
                 if ratio > 0.5:  # 키워드가 장소명의 50% 이상을 차지
                     score += 0.7
-                    logger.debug(f"주요 부분 일치 ({ratio:.2f}): +0.7")
+                    logger.debug("주요 부분 일치 (%.2f): +0.7", ratio)
                 else:
                     score += 0.4  # 일반 부분 일치
-                    logger.debug(f"부분 일치 ({ratio:.2f}): +0.4")
-        
-        # 2. 개별 단어 매칭 (더 엄격하게)
-        keyword_words = [w for w in keyword.split() if len(w) >= 2]
-        place_words = [w for w in place_name.split() if len(w) >= 2]
-        
-        matched_words = 0
-        for kw in keyword_words:
-            kw_norm = kw.lower()
-            for pw in place_words:
-                pw_norm = pw.lower()
-                if kw_norm == pw_norm:  # 정확한 단어 일치만
-                    matched_words += 1
-                    score += 0.3
-                    logger.debug(f"단어 일치 '{kw}': +0.3")
-                    break
+                    logger.debug("부분 일치 (%.2f): +0.4", ratio)
+        
+        # 2. 개별 단어 매칭 (더 엄격하게) - 장소명 단어는 한 번만 소문자로 바꿔 집합으로 조회
+        place_words = {w.lower() for w in place_name.split() if len(w) >= 2}
+        
+        for kw in keyword.split():
+            if len(kw) >= 2 and kw.lower() in place_words:  # 정확한 단어 일치만
+                score += 0.3
+                logger.debug("단어 일치 '%s': +0.3", kw)
         
         # 3. 카테고리 관련성
-        tourism_keywords = ['관광', '명소', '문화', '체험', '공원', '박물관', '미술관', '케이블카', '전망대', '해상']
-        if any(word in place_category for word in tourism_keywords):
+        if any(word in place_category for word in _TOURISM_CATEGORY_KEYWORDS):
             score += 0.2
-            logger.debug(f"관광 카테고리: +0.2")
+            logger.debug("관광 카테고리: +0.2")
         
         # 4. 페널티: 관련 없는 키워드가 있으면 점수 감점
-        irrelevant_in_name = ['정비', '수리', '부동산', '병원', '의원']
-        for irrelevant in irrelevant_in_name:
+        for irrelevant in _IRRELEVANT_NAME_KEYWORDS:
             if irrelevant in place_normalized:
                 score -= 0.5
-                logger.debug(f"관련없는 키워드 '{irrelevant}': -0.5")
+                logger.debug("관련없는 키워드 '%s': -0.5", irrelevant)
         
         final_score = max(0.0, min(score, 1.0))  # 0.0 ~ 1.0 범위 제한
-        logger.debug(f"최종 점수: {final_score:.2f}")
+        logger.debug("최종 점수: %.2f", final_score)
         return final_score
     
     def _calculate_exact_match_score(self, keyword: str, place_name: str) -> float:
@@ -345,7 +340,7 @@ class KakaoPlaceService:
             # 중요한 단어가 모두 포함되어야 함
             missing_important = [w for w in keyword_words if w not in place_name]
             if missing_important:
-                logger.warning(f"중요 단어 누락: {missing_important}")
+                logger.warning("중요 단어 누락: %s", missing_important)
                 return 0.0  # 중요한 단어가 빠지면 0점
         
         return max(0.0, similarity)
@@ -385,11 +380,11 @@ class KakaoPlaceService:
                 district = part.replace(' ', '')
                 # 유효한 구/군 목록에 있는지 확인
                 if district not in valid_districts:
-                    logger.error(f"❌ 잘못된 행정구역: '{target_city}'에는 '{district}'가 존재하지 않음")
+                    logger.error("❌ 잘못된 행정구역: '%s'에는 '%s'가 존재하지 않음", target_city, district)
                     found_invalid = True
                     break
                 else:
-                    logger.info(f"✅ 올바른 행정구역: '{district}' ('{target_city}'에 존재)")
+                    logger.info("✅ 올바른 행정구역: '%s' ('%s'에 존재)", district, target_city)
         
         return not found_invalid
     
@@ -445,7 +440,7 @@ class KakaoPlaceService:
             has_specific_pattern = any(re.search(pattern, location_text) for pattern in specific_patterns)
             
             if not has_specific_pattern:
-                logger.warning(f"모호한 장소명 감지: '{location_text}' - 구체적인 고유명사가 필요합니다")
+                logger.warning("모호한 장소명 감지: '%s' - 구체적인 고유명사가 필요합니다", location_text)
                 return True
         
         return False
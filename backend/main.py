@@ -5,30 +5,44 @@
 # FastAPI 프레임워크를 사용하여 만들어졌습니다.
 
 # 필요한 라이브러리들을 가져옵니다 (import)
-from fastapi import FastAPI, HTTPException  # FastAPI: 웹 서버 프레임워크, HTTPException: 에러 처리용
+from fastapi import FastAPI, HTTPException, Query, Request  # FastAPI: 웹 서버 프레임워크, HTTPException: 에러 처리용
 from fastapi.middleware.cors import CORSMiddleware  # CORS: 웹 브라우저의 보안 정책 관련
-from fastapi.responses import StreamingResponse  # SSE를 위한 StreamingResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse  # ORJSONResponse: 빠른 JSON 응답, StreamingResponse: SSE용
 from pydantic import BaseModel  # 데이터 검증을 위한 라이브러리
-from typing import List, Optional  # 타입 힌트를 위한 라이브러리
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional  # 타입 힌트를 위한 라이브러리
 import openai  # OpenAI API 사용을 위한 라이브러리
 import os  # 운영체제 관련 기능 (환경변수 등)
+import sys  # 문자열 인터닝(sys.intern)용
 from dotenv import load_dotenv  # .env 파일에서 환경변수를 로드하는 라이브러리
 import json  # JSON 데이터 처리용
+import hashlib  # 캐시 키 해시용
+import orjson  # 빠른 JSON 직렬화/역직렬화용 (요청 처리 경로)
 import logging  # 로그 기록용
-from datetime import datetime, timedelta  # 날짜와 시간 처리용
+from datetime import date, datetime, timedelta  # 날짜와 시간 처리용
 import urllib.parse  # URL 인코딩용
 import requests  # HTTP 요청을 위한 라이브러리
+from requests.adapters import HTTPAdapter  # 연결 풀 설정용
 import re  # 정규표현식을 위한 라이브러리
+from string import Template  # 프롬프트 템플릿용
 import asyncio  # 비동기 처리를 위한 라이브러리
+import time  # 캐시 만료 시간 계산용
+import threading  # 피드백 파일 동시 쓰기 보호용
+from collections import OrderedDict  # LRU 캐시용
+from functools import lru_cache  # 함수 결과 캐싱용
+from contextlib import contextmanager  # 구간별 시간 측정용
 from kakao_location_validator import KakaoLocationValidator, PlaceValidationResult
 from kakao_geocoding import KakaoGeocodingService
 from kakao_place_service import KakaoPlaceService
+from trip_chat_edits import try_local_modify
 
 load_dotenv()
 
 # 카카오 API 인증
 KAKAO_API_KEY = os.getenv("KAKAO_API_KEY")
 
+# 카카오 검색 연결 풀 크기 (동시에 검증하는 활동 수만큼 연결을 재사용)
+_KAKAO_POOL_SIZE = 16
+
 # ========================================
 # 카카오 로컬 API 서비스 클래스
 # ========================================
@@ -39,6 +53,12 @@ class KakaoLocalService:
         self.api_key = api_key or kakao_api_key
         self.base_url = "https://dapi.kakao.com/v2/local/search/keyword.json"
         
+        # 모든 검색 요청이 같은 호스트로 가므로 세션 하나로 연결(TCP/TLS)을 재사용합니다
+        self.session = requests.Session()
+        if self.api_key:
+            self.session.headers["Authorization"] = f"KakaoAK {self.api_key}"
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=_KAKAO_POOL_SIZE))
+        
     def search_place(self, query: str, region: str = None) -> dict:
         """
         카카오 로컬 API를 사용하여 장소를 검색합니다.
@@ -53,10 +73,6 @@ class KakaoLocalService:
         if not self.api_key:
             logger.warning("카카오 API 키가 없어 장소 검색을 건너뜁니다.")
             return None
-            
-        headers = {
-            "Authorization": f"KakaoAK {self.api_key}"
-        }
         
         params = {
             "query": query,
@@ -68,7 +84,7 @@ class KakaoLocalService:
             params["query"] = f"{region} {query}"
             
         try:
-            response = requests.get(self.base_url, headers=headers, params=params)
+            response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -89,11 +105,11 @@ class KakaoLocalService:
                     'url': place.get('place_url', '')
                 }
             else:
-                logger.warning(f"카카오 API에서 '{query}' 장소를 찾을 수 없습니다.")
+                logger.warning("카카오 API에서 '%s' 장소를 찾을 수 없습니다.", query)
                 return {'found': False, 'query': query}
                 
         except requests.exceptions.RequestException as e:
-            logger.error(f"카카오 API 요청 실패: {str(e)}")
+            logger.error("카카오 API 요청 실패: %s", e)
             return {'found': False, 'error': str(e), 'query': query}
             
     def _clean_place_name(self, place_name: str) -> str:
@@ -135,7 +151,7 @@ class KakaoLocalService:
         
         for inappropriate in inappropriate_categories:
             if inappropriate in result_name or inappropriate in result_category:
-                logger.warning(f"부적절한 카테고리 감지: {result_name} ({result_category})")
+                logger.warning("부적절한 카테고리 감지: %s (%s)", result_name, result_category)
                 return False
         
         return True
@@ -349,7 +365,7 @@ class KakaoLocalService:
         title = activity.get('title', '')
         location = activity.get('location', '')
         
-        logger.info(f"🔍 장소 검증 시작: '{title}' (location: '{location}')")
+        logger.info("🔍 장소 검증 시작: '%s' (location: '%s')", title, location)
         
         # 검색 키워드 우선순위 생성
         search_keywords = []
@@ -374,10 +390,10 @@ class KakaoLocalService:
         # 3. location이 상세 주소인 경우 처리
         if location and location.strip() and self._is_detailed_address(location.strip()):
             # 상세 주소는 후순위로 (보조 수단)
-            logger.info(f"상세 주소 감지, 후순위로 이동: {location.strip()}")
+            logger.info("상세 주소 감지, 후순위로 이동: %s", location.strip())
         elif location and location.strip() and not self._is_real_place_name(location.strip()):
             # location이 장소명이 아닌 경우도 후순위로
-            logger.info(f"일반적이지 않은 location, 후순위로 이동: {location.strip()}")
+            logger.info("일반적이지 않은 location, 후순위로 이동: %s", location.strip())
         
         # 3. 원본 title도 포함 (중간 순위)
         if title not in search_keywords:
@@ -388,7 +404,7 @@ class KakaoLocalService:
             if location.strip() not in search_keywords:
                 search_keywords.append(location.strip())
         
-        logger.info(f"🔍 검색 키워드 목록: {search_keywords}")
+        logger.info("🔍 검색 키워드 목록: %s", search_keywords)
         
         # 키워드별로 순차 검색
         search_result = None
@@ -398,20 +414,20 @@ class KakaoLocalService:
             if not keyword or len(keyword.strip()) < 2:
                 continue
                 
-            logger.info(f"🔍 키워드로 검색 중: '{keyword}'")
+            logger.info("🔍 키워드로 검색 중: '%s'", keyword)
             search_result = self.search_place(keyword, region)
             
             if search_result and search_result.get('found'):
                 # 검색 결과의 관련성 검증
                 if self._is_relevant_result(keyword, search_result, title):
                     successful_keyword = keyword
-                    logger.info(f"✅ 검색 성공: '{keyword}' -> {search_result.get('name')}")
+                    logger.info("✅ 검색 성공: '%s' -> %s", keyword, search_result.get('name'))
                     break
                 else:
-                    logger.info(f"❌ 검색 결과 관련성 낮음: '{keyword}' -> {search_result.get('name')}")
+                    logger.info("❌ 검색 결과 관련성 낮음: '%s' -> %s", keyword, search_result.get('name'))
                     search_result = None
             else:
-                logger.info(f"❌ 검색 실패: '{keyword}'")
+                logger.info("❌ 검색 실패: '%s'", keyword)
         
         # 검증된 정보로 활동 정보 업데이트
         if search_result and search_result.get('found'):
@@ -429,19 +445,56 @@ class KakaoLocalService:
                 activity['verified_name'] = search_result.get('name')
                 activity['location'] = search_result.get('road_address') or search_result.get('address') or activity['location']
                 
-            logger.info(f"🎉 장소 검증 완료: '{title}' -> '{search_result.get('name')}' (키워드: '{successful_keyword}')")
-            logger.info(f"   주소: {activity['real_address']}")
-            logger.info(f"   카테고리: {activity['place_category']}")
+            logger.info("🎉 장소 검증 완료: '%s' -> '%s' (키워드: '%s')", title, search_result.get('name'), successful_keyword)
+            logger.info("   주소: %s", activity['real_address'])
+            logger.info("   카테고리: %s", activity['place_category'])
         else:
             activity['verified'] = False
             # 검증 실패한 경우 가짜 주소 표시 방지
             activity['location'] = f"⚠️ {activity.get('location', '')} (검증되지 않은 주소)"
             activity['real_address'] = "검증되지 않은 주소입니다"
-            logger.warning(f"⚠️ 장소 검증 실패: '{title}' - 모든 키워드로 검색했지만 찾을 수 없습니다")
-            logger.warning(f"   시도한 키워드: {search_keywords}")
+            logger.warning("⚠️ 장소 검증 실패: '%s' - 모든 키워드로 검색했지만 찾을 수 없습니다", title)
+            logger.warning("   시도한 키워드: %s", search_keywords)
             
         return activity
 
+# ========================================
+# AI 응답 JSON 파싱 함수
+# ========================================
+# 설명 문구가 섞인 응답에서 JSON 객체 하나만 읽어내는 디코더 (상태가 없으므로 공유)
+_JSON_DECODER = json.JSONDecoder()
+
+# ```json 코드 블록 안의 JSON 시작 위치를 찾는 패턴 (코드 블록 앞 설명 문구에 '{'가 있어도 건너뛰도록)
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{)', re.IGNORECASE)
+
+def _parse_json_object(content: str) -> Optional[dict]:
+    """
+    AI 응답에서 JSON 객체를 파싱합니다.
+    
+    응답 전체가 JSON이면 바로 파싱하고, 설명 문구가 섞여 있으면
+    ```json 코드 블록(없으면 첫 번째 '{')부터 한 번의 디코딩으로 객체 하나만 파싱합니다.
+    
+    Returns:
+        파싱된 딕셔너리 (JSON 객체가 없으면 None)
+    """
+    try:
+        data = orjson.loads(content)
+        if isinstance(data, dict):
+            return data
+    except orjson.JSONDecodeError:
+        pass
+    
+    # 코드 블록이 있으면 블록 안의 '{'부터, 없으면 첫 '{'부터 파싱합니다
+    fence = _JSON_FENCE_RE.search(content)
+    start = fence.start(1) if fence else content.find('{')
+    if start == -1:
+        return None
+    
+    # 시작 '{'부터 JSON 값 하나만 디코딩합니다 (객체가 끝나는 지점에서 멈추므로 뒤쪽 설명 문구는 무시)
+    # 객체가 닫히지 않았거나 형식이 잘못되면 파싱 오류(JSONDecodeError)를 그대로 전달합니다
+    data, _ = _JSON_DECODER.raw_decode(content, start)
+    return data
+
 # ========================================
 # 여행 데이터 검증 및 보강 함수
 # ========================================
@@ -456,7 +509,8 @@ async def verify_and_enrich_trip_data(trip_data: dict, kakao_service: KakaoLocal
     failed_activities = []
     region = destination.split()[0]  # 지역명 추출 (예: "부산 해운대" -> "부산")
     
-    # 각 일차별로 활동 검증
+    # 각 일차별로 검증할 활동 수집
+    targets = []
     for day_idx, day in enumerate(trip_data["itinerary"]):
         if not day.get("activities"):
             continue
@@ -466,25 +520,30 @@ async def verify_and_enrich_trip_data(trip_data: dict, kakao_service: KakaoLocal
             title = activity.get('title', '').lower()
             if any(keyword in title for keyword in ['호텔', '숙박', '체크인', '체크아웃', 'hotel', 'check-in', 'check-out']):
                 continue
-            
-            # 카카오 API로 장소 검증 및 보강
-            verified_activity = kakao_service.verify_and_enrich_location(activity, region)
-            
-            # 검증 실패한 활동 기록
-            if not verified_activity.get('verified', False):
-                failed_activities.append({
-                    'day_idx': day_idx,
-                    'activity_idx': activity_idx,
-                    'day': day.get('day'),
-                    'original_activity': activity.copy()
-                })
-            
-            # 검증된 정보로 업데이트
-            day["activities"][activity_idx] = verified_activity
+            targets.append((day_idx, activity_idx, day, activity))
+    
+    # 카카오 API로 장소 검증 및 보강 (동기 HTTP 호출이므로 스레드에서 모든 활동을 동시에 검증)
+    verified_activities = await asyncio.gather(*(
+        asyncio.to_thread(kakao_service.verify_and_enrich_location, activity, region)
+        for _, _, _, activity in targets
+    ))
+    
+    for (day_idx, activity_idx, day, activity), verified_activity in zip(targets, verified_activities):
+        # 검증 실패한 활동 기록
+        if not verified_activity.get('verified', False):
+            failed_activities.append({
+                'day_idx': day_idx,
+                'activity_idx': activity_idx,
+                'day': day.get('day'),
+                'original_activity': activity.copy()
+            })
+        
+        # 검증된 정보로 업데이트
+        day["activities"][activity_idx] = verified_activity
     
     # 검증 실패한 활동이 있으면 재생성
     if failed_activities:
-        logger.info(f"검증 실패한 활동 {len(failed_activities)}개를 재생성합니다...")
+        logger.info("검증 실패한 활동 %s개를 재생성합니다...", len(failed_activities))
         trip_data = await regenerate_failed_activities(trip_data, failed_activities, destination)
         
         # 재생성 후 중복 체크 및 제거
@@ -523,14 +582,14 @@ async def regenerate_failed_activities(trip_data: dict, failed_activities: list,
             regeneration_prompt = f"""Replace failed activity "{original.get('title', '')}" with real {destination} tourist spot.
 
 🚨 **NO DUPLICATES**: Don't use these already used places:
-{json.dumps(all_used_locations, ensure_ascii=False, indent=2)}
+{orjson.dumps(all_used_locations).decode()}
 
 **🌏 LANGUAGE REQUIREMENT:**
 - Write all activity titles and descriptions in Korean language
 - Use Korean for all text content in the response
 
 Current day {day_num} activities:
-{json.dumps(other_activities, ensure_ascii=False, indent=2)}
+{orjson.dumps(other_activities).decode()}
 
 🚨 **RULES**:
 1. **NO duplicates with listed places above** - TOP PRIORITY!
@@ -564,7 +623,7 @@ JSON format:
 """
             
             # OpenAI API 호출
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": "You are a Korean tourism expert. Replace failed fake places with real famous tourist spots. 🚨 TOP RULE: NO duplicates with already used places! Don't create fake addresses or non-existent places. Use only famous landmarks you're certain about."},
@@ -577,15 +636,12 @@ JSON format:
             content = response.choices[0].message.content.strip()
             
             # JSON 파싱
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx]
-                new_activity = json.loads(json_str)
+            new_activity = _parse_json_object(content)
+            if new_activity is not None:
                 
                 # 새로운 활동으로 교체
                 trip_data["itinerary"][day_idx]["activities"][activity_idx] = new_activity
-                logger.info(f"{day_num}일차 활동 재생성 완료: {original.get('title')} -> {new_activity.get('title')}")
+                logger.info("%s일차 활동 재생성 완료: %s -> %s", day_num, original.get('title'), new_activity.get('title'))
                 
                 # 재생성된 활동이 다른 날짜와 중복되는지 즉시 체크
                 new_title = new_activity.get('title', '').lower()
@@ -600,13 +656,13 @@ JSON format:
                         
                         if (new_title and check_title and new_title in check_title) or \
                            (new_location and check_location and new_location in check_location):
-                            logger.warning(f"🚨 재생성된 활동이 중복 의심: {day_num}일차 '{new_activity.get('title')}' vs {check_day.get('day')}일차 '{check_activity.get('title')}'")
+                            logger.warning("🚨 재생성된 활동이 중복 의심: %s일차 '%s' vs %s일차 '%s'", day_num, new_activity.get('title'), check_day.get('day'), check_activity.get('title'))
                             
             else:
-                logger.error(f"{day_num}일차 활동 재생성 실패: JSON 파싱 오류")
+                logger.error("%s일차 활동 재생성 실패: JSON 파싱 오류", day_num)
                 
         except Exception as e:
-            logger.error(f"{day_num}일차 활동 재생성 중 오류 발생: {str(e)}")
+            logger.error("%s일차 활동 재생성 중 오류 발생: %s", day_num, e)
     
     return trip_data
 
@@ -636,50 +692,51 @@ def _extract_location_keywords(place_name: str, location_name: str) -> list:
     
     return list(filter(None, keywords))
 
+# 핵심 지명 패턴 (모듈 로드 시 한 번만 컴파일)
+_CORE_LOCATION_PATTERNS = tuple(re.compile(pattern) for pattern in [
+    r'([가-힣]{2,}해수욕장|[가-힣]{2,}해변)',  # 해변/해수욕장
+    r'([가-힣]{2,}시장)',                      # 시장
+    r'([가-힣]{2,}궁|[가-힣]{2,}궁궐)',        # 궁궐
+    r'([가-힣]{2,}사|[가-힣]{2,}절)',          # 사찰
+    r'([가-힣]{2,}타워|[가-힣]{2,}탑)',        # 타워/탑
+    r'([가-힣]{2,}공원)',                      # 공원
+    r'([가-힣]{2,}박물관)',                    # 박물관
+    r'([가-힣]{2,}미술관)',                    # 미술관
+    r'([가-힣]{2,}폭포)',                      # 폭포
+    r'([가-힣]{2,}산)',                        # 산
+    r'([가-힣]{2,}봉)',                        # 봉우리
+    r'([가-힣]{2,}다리)',                      # 다리
+    r'([가-힣]{2,}항|[가-힣]{2,}포구)',        # 항구/포구
+    r'([가-힣]{2,}마을)',                      # 마을
+    r'([가-힣]{2,}거리|[가-힣]{2,}길)',        # 거리/길
+    r'([가-힣]{2,}동)',                        # 동네
+    r'([가-힣]{2,}구)',                        # 구
+    r'([가-힣]{2,}섬|[가-힣]{2,}도)',          # 섬/도
+])
+
+# 복합 지명 패턴: (지명, 시설명) 그룹으로 추출
+_COMPOUND_LOCATION_PATTERNS = tuple(re.compile(pattern) for pattern in [
+    r'([가-힣]{2,})(해수욕장|해변|시장|궁|사|탑|타워|공원|박물관|미술관)',
+    r'([가-힣]{2,})(문화마을|관광지|전망대|케이블카)',
+])
+
 def _extract_core_location_name(text: str) -> set:
     """텍스트에서 핵심 장소명을 추출합니다."""
-    import re
     keywords = set()
     
     # 텍스트 정리
     text = text.lower().strip()
     
     # 1. 핵심 지명 패턴 추출
-    core_patterns = [
-        r'([가-힣]{2,}해수욕장|[가-힣]{2,}해변)',  # 해변/해수욕장
-        r'([가-힣]{2,}시장)',                      # 시장
-        r'([가-힣]{2,}궁|[가-힣]{2,}궁궐)',        # 궁궐
-        r'([가-힣]{2,}사|[가-힣]{2,}절)',          # 사찰
-        r'([가-힣]{2,}타워|[가-힣]{2,}탑)',        # 타워/탑
-        r'([가-힣]{2,}공원)',                      # 공원
-        r'([가-힣]{2,}박물관)',                    # 박물관
-        r'([가-힣]{2,}미술관)',                    # 미술관
-        r'([가-힣]{2,}폭포)',                      # 폭포
-        r'([가-힣]{2,}산)',                        # 산
-        r'([가-힣]{2,}봉)',                        # 봉우리
-        r'([가-힣]{2,}다리)',                      # 다리
-        r'([가-힣]{2,}항|[가-힣]{2,}포구)',        # 항구/포구
-        r'([가-힣]{2,}마을)',                      # 마을
-        r'([가-힣]{2,}거리|[가-힣]{2,}길)',        # 거리/길
-        r'([가-힣]{2,}동)',                        # 동네
-        r'([가-힣]{2,}구)',                        # 구
-        r'([가-힣]{2,}섬|[가-힣]{2,}도)',          # 섬/도
-    ]
-    
-    for pattern in core_patterns:
-        matches = re.findall(pattern, text)
+    for pattern in _CORE_LOCATION_PATTERNS:
+        matches = pattern.findall(text)
         for match in matches:
             keywords.add(match)
     
     # 2. 복합 지명에서 핵심 부분 추출
     # 예: "해운대해수욕장 산책" → "해운대", "해운대해수욕장"
-    compound_patterns = [
-        r'([가-힣]{2,})(해수욕장|해변|시장|궁|사|탑|타워|공원|박물관|미술관)',
-        r'([가-힣]{2,})(문화마을|관광지|전망대|케이블카)',
-    ]
-    
-    for pattern in compound_patterns:
-        matches = re.findall(pattern, text)
+    for pattern in _COMPOUND_LOCATION_PATTERNS:
+        matches = pattern.findall(text)
         for match in matches:
             if len(match) == 2:  # (지명, 시설명) 튜플
                 keywords.add(match[0])  # 지명 부분
@@ -706,37 +763,37 @@ def _extract_core_location_name(text: str) -> set:
     
     return keywords
 
+# 주요 관광지 패턴 (모듈 로드 시 한 번만 컴파일)
+_MAJOR_LOCATION_PATTERNS = tuple(re.compile(pattern) for pattern in [
+    r'([가-힣]{2,}케이블카)',     # 해상케이블카, 남산케이블카
+    r'([가-힣]{2,}도)',          # 오동도, 제주도
+    r'([가-힣]{2,}해수욕장)',    # 해운대해수욕장
+    r'([가-힣]{2,}해변)',        # 경포해변
+    r'([가-힣]{2,}폭포)',        # 천지연폭포
+    r'([가-힣]{2,}공원)',        # 남산공원
+    r'([가-힣]{2,}시장)',        # 자갈치시장
+    r'([가-힣]{2,}박물관)',      # 국립중앙박물관
+    r'([가-힣]{2,}미술관)',      # 국립현대미술관
+    r'([가-힣]{2,}사)',          # 불국사
+    r'([가-힣]{2,}궁)',          # 경복궁
+    r'([가-힣]{2,}성)',          # 수원화성
+    r'([가-힣]{2,}탑)',          # 남산타워
+    r'([가-힣]{2,}다리)',        # 광안대교
+    r'([가-힣]{2,}항)',          # 부산항
+    r'([가-힣]{2,}역)',          # 서울역
+    r'([가-힣]{2,}터미널)',      # 고속터미널
+    r'([가-힣]{2,}전망대)',      # 부산타워전망대
+    r'([가-힣]{2,}아쿠아리움)',  # 코엑스아쿠아리움
+    r'([가-힣]{2,}테마파크)',    # 에버랜드테마파크
+])
+
 def _extract_major_location_keywords(text: str) -> set:
     """텍스트에서 주요 장소 키워드를 추출합니다."""
-    import re
     keywords = set()
     
     # 주요 관광지 패턴들
-    patterns = [
-        r'([가-힣]{2,}케이블카)',     # 해상케이블카, 남산케이블카
-        r'([가-힣]{2,}도)',          # 오동도, 제주도
-        r'([가-힣]{2,}해수욕장)',    # 해운대해수욕장
-        r'([가-힣]{2,}해변)',        # 경포해변
-        r'([가-힣]{2,}폭포)',        # 천지연폭포
-        r'([가-힣]{2,}공원)',        # 남산공원
-        r'([가-힣]{2,}시장)',        # 자갈치시장
-        r'([가-힣]{2,}박물관)',      # 국립중앙박물관
-        r'([가-힣]{2,}미술관)',      # 국립현대미술관
-        r'([가-힣]{2,}사)',          # 불국사
-        r'([가-힣]{2,}궁)',          # 경복궁
-        r'([가-힣]{2,}성)',          # 수원화성
-        r'([가-힣]{2,}탑)',          # 남산타워
-        r'([가-힣]{2,}다리)',        # 광안대교
-        r'([가-힣]{2,}항)',          # 부산항
-        r'([가-힣]{2,}역)',          # 서울역
-        r'([가-힣]{2,}터미널)',      # 고속터미널
-        r'([가-힣]{2,}전망대)',      # 부산타워전망대
-        r'([가-힣]{2,}아쿠아리움)',  # 코엑스아쿠아리움
-        r'([가-힣]{2,}테마파크)',    # 에버랜드테마파크
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
+    for pattern in _MAJOR_LOCATION_PATTERNS:
+        matches = pattern.findall(text)
         for match in matches:
             keywords.add(match.lower())
     
@@ -830,28 +887,26 @@ def _is_similar_location(keyword1: str, keyword2: str) -> bool:
     
     return False
 
+# 핵심 지역명 패턴: (지역명, 시설명) 그룹으로 추출
+_CORE_LOCATION_PART_PATTERNS = tuple(re.compile(pattern) for pattern in [
+    r'([가-힣]{2,})(해수욕장|해변|시장|궁|사|탑|타워|공원|박물관|미술관|폭포|산|봉|다리|항|마을|거리|동|구|섬|도)',
+    r'([가-힣]{2,})(문화마을|관광지|전망대|케이블카|아쿠아리움|테마파크)',
+])
+
 def _extract_core_location_parts(keyword1: str, keyword2: str) -> set:
     """두 키워드에서 공통된 핵심 지역명을 추출합니다."""
-    import re
-    
-    # 핵심 지역명 패턴
-    location_patterns = [
-        r'([가-힣]{2,})(해수욕장|해변|시장|궁|사|탑|타워|공원|박물관|미술관|폭포|산|봉|다리|항|마을|거리|동|구|섬|도)',
-        r'([가-힣]{2,})(문화마을|관광지|전망대|케이블카|아쿠아리움|테마파크)',
-    ]
-    
     cores1 = set()
     cores2 = set()
     
-    for pattern in location_patterns:
+    for pattern in _CORE_LOCATION_PART_PATTERNS:
         # keyword1에서 핵심 지역명 추출
-        matches1 = re.findall(pattern, keyword1)
+        matches1 = pattern.findall(keyword1)
         for match in matches1:
             if len(match) == 2:
                 cores1.add(match[0])  # 지역명 부분만
         
         # keyword2에서 핵심 지역명 추출
-        matches2 = re.findall(pattern, keyword2)
+        matches2 = pattern.findall(keyword2)
         for match in matches2:
             if len(match) == 2:
                 cores2.add(match[0])  # 지역명 부분만
@@ -930,7 +985,7 @@ async def remove_duplicate_locations(trip_data: dict, destination: str) -> dict:
             continue
         
         day_num = day.get('day', day_idx + 1)
-        logger.info(f"{day_num}일차 중복 검사 시작...")
+        logger.info("%s일차 중복 검사 시작...", day_num)
             
         for activity_idx, activity in enumerate(day["activities"]):
             # 호텔/숙박 관련 활동은 체크하지 않음
@@ -967,7 +1022,7 @@ async def remove_duplicate_locations(trip_data: dict, destination: str) -> dict:
             
             if is_duplicate:
                 # 중복 발견 시 즉시 교체
-                logger.info(f"🔄 중복 장소 즉시 교체: {day_num}일차 '{place_name}' (키워드: {duplicate_key})")
+                logger.info("🔄 중복 장소 즉시 교체: %s일차 '%s' (키워드: %s)", day_num, place_name, duplicate_key)
                 
                 # 단일 활동 교체
                 new_activity = await replace_single_duplicate_activity(
@@ -981,11 +1036,11 @@ async def remove_duplicate_locations(trip_data: dict, destination: str) -> dict:
                     new_location = new_activity.get('location', 'N/A')
                     new_real_address = new_activity.get('real_address', 'N/A')
                     
-                    logger.info(f"🔄 장소 교체 상세:")
-                    logger.info(f"   이전: '{place_name}' -> {original_location}")
-                    logger.info(f"   이후: '{new_title}' -> {new_location}")
+                    logger.info("🔄 장소 교체 상세:")
+                    logger.info("   이전: '%s' -> %s", place_name, original_location)
+                    logger.info("   이후: '%s' -> %s", new_title, new_location)
                     if new_activity.get('verified'):
-                        logger.info(f"   검증된 주소: {new_real_address}")
+                        logger.info("   검증된 주소: %s", new_real_address)
                     
                     trip_data["itinerary"][day_idx]["activities"][activity_idx] = new_activity
                     fixed_count += 1
@@ -999,7 +1054,7 @@ async def remove_duplicate_locations(trip_data: dict, destination: str) -> dict:
                         if key:
                             visited_locations.add(key)
                     
-                    logger.info(f"✅ 교체 완료: {place_name} → {new_activity.get('title')}")
+                    logger.info("✅ 교체 완료: %s → %s", place_name, new_activity.get('title'))
                 else:
                     # 교체 실패 시 원래 활동의 키워드를 추가 (무한 루프 방지)
                     for key in location_keys:
@@ -1012,7 +1067,7 @@ async def remove_duplicate_locations(trip_data: dict, destination: str) -> dict:
                         visited_locations.add(key)
     
     if fixed_count > 0:
-        logger.info(f"✅ 총 {fixed_count}개의 중복 장소를 교체했습니다.")
+        logger.info("✅ 총 %s개의 중복 장소를 교체했습니다.", fixed_count)
     else:
         logger.info("✅ 중복 장소가 발견되지 않았습니다.")
     
@@ -1063,7 +1118,7 @@ async def replace_single_duplicate_activity(trip_data: dict, day_idx: int, activ
 """
         
         # OpenAI API 호출 (더 빠른 설정)
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": f"You are a {destination} tourism expert. Quickly replace duplicate places with different famous tourist spots. Respond simply and quickly."},
@@ -1076,11 +1131,8 @@ async def replace_single_duplicate_activity(trip_data: dict, day_idx: int, activ
         content = response.choices[0].message.content.strip()
         
         # JSON 파싱
-        start_idx = content.find('{')
-        end_idx = content.rfind('}') + 1
-        if start_idx != -1 and end_idx != -1:
-            json_str = content[start_idx:end_idx]
-            new_activity = json.loads(json_str)
+        new_activity = _parse_json_object(content)
+        if new_activity is not None:
             
             # 🔥 중요: 새로운 활동의 주소를 카카오 API로 즉시 검증 및 업데이트
             region = destination.split()[0] if destination else ""
@@ -1088,14 +1140,14 @@ async def replace_single_duplicate_activity(trip_data: dict, day_idx: int, activ
             
             # 검증된 정보로 업데이트
             if verified_activity.get('verified', False):
-                logger.info(f"🔄 교체된 장소 주소 업데이트: '{new_activity.get('title')}' -> {verified_activity.get('real_address', 'N/A')}")
+                logger.info("🔄 교체된 장소 주소 업데이트: '%s' -> %s", new_activity.get('title'), verified_activity.get('real_address', 'N/A'))
                 return verified_activity
             else:
-                logger.warning(f"⚠️ 교체된 장소 '{new_activity.get('title')}'의 주소 검증 실패")
+                logger.warning("⚠️ 교체된 장소 '%s'의 주소 검증 실패", new_activity.get('title'))
                 return new_activity
         
     except Exception as e:
-        logger.error(f"단일 활동 교체 중 오류: {str(e)}")
+        logger.error("단일 활동 교체 중 오류: %s", e)
     
     return None
 
@@ -1190,7 +1242,7 @@ Replace with **completely different new place** in {destination}.
 - Use Korean for all text content in the response
 
 **Current day {day_num} other activities:**
-{json.dumps(other_activities, ensure_ascii=False, indent=2)}
+{orjson.dumps(other_activities).decode()}
 
 **🚫 BANNED PLACES (already in schedule):**
 {', '.join(sorted(list(all_used_locations))[:20])}
@@ -1229,7 +1281,7 @@ Replace with **completely different new place** in {destination}.
 """
             
             # OpenAI API 호출
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": """You are a Korean tourism expert handling duplicate place replacement.
@@ -1251,11 +1303,8 @@ Replace with **completely different new place** in {destination}.
             content = response.choices[0].message.content.strip()
             
             # JSON 파싱
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx]
-                new_activity = json.loads(json_str)
+            new_activity = _parse_json_object(content)
+            if new_activity is not None:
                 
                 # 교체된 장소가 또 다른 중복이 아닌지 검증
                 new_keywords = _extract_location_keywords(
@@ -1268,14 +1317,14 @@ Replace with **completely different new place** in {destination}.
                 for new_keyword in new_keywords:
                     if new_keyword in all_used_locations:
                         is_still_duplicate = True
-                        logger.warning(f"교체된 장소도 중복됨: {new_keyword}")
+                        logger.warning("교체된 장소도 중복됨: %s", new_keyword)
                         break
                     
                     # 더 정교한 유사성 검사
                     for used_keyword in all_used_locations:
                         if _is_similar_location(new_keyword, used_keyword):
                             is_still_duplicate = True
-                            logger.warning(f"교체된 장소가 유사함: {new_keyword} ≈ {used_keyword}")
+                            logger.warning("교체된 장소가 유사함: %s ≈ %s", new_keyword, used_keyword)
                             break
                     
                     if is_still_duplicate:
@@ -1288,16 +1337,16 @@ Replace with **completely different new place** in {destination}.
                     # 새로운 장소를 방문 목록에 추가
                     visited_locations.update(new_keywords)
                     
-                    logger.info(f"✅ {day_num}일차 중복 장소 교체 완료: {original.get('title')} -> {new_activity.get('title')}")
+                    logger.info("✅ %s일차 중복 장소 교체 완료: %s -> %s", day_num, original.get('title'), new_activity.get('title'))
                 else:
                     # 여전히 중복이면 원본 유지하고 경고
-                    logger.error(f"❌ {day_num}일차 교체 실패 - 새 장소도 중복됨: {new_activity.get('title')}")
-                    logger.info(f"원본 활동 유지: {original.get('title')}")
+                    logger.error("❌ %s일차 교체 실패 - 새 장소도 중복됨: %s", day_num, new_activity.get('title'))
+                    logger.info("원본 활동 유지: %s", original.get('title'))
             else:
-                logger.error(f"{day_num}일차 중복 장소 교체 실패: JSON 파싱 오류")
+                logger.error("%s일차 중복 장소 교체 실패: JSON 파싱 오류", day_num)
                 
         except Exception as e:
-            logger.error(f"{day_num}일차 중복 장소 교체 중 오류 발생: {str(e)}")
+            logger.error("%s일차 중복 장소 교체 중 오류 발생: %s", day_num, e)
     
     return trip_data
 
@@ -1324,14 +1373,37 @@ kakao_api_key = os.getenv("KAKAO_API_KEY")
 if not kakao_api_key:
     logger.warning("KAKAO_API_KEY가 설정되지 않았습니다. 장소 검증 기능이 제한됩니다.")
 
-# OpenAI 클라이언트를 초기화합니다 (최신 버전 호환)
-client = openai.OpenAI(api_key=openai_api_key)
+# 디버그 로그 여부 (PLANNER_DEBUG 환경변수가 설정된 경우에만 상세 로그 출력)
+_DEBUG = __debug__ and bool(os.getenv("PLANNER_DEBUG"))
+if _DEBUG:
+    logger.setLevel(logging.DEBUG)
+
+# 구간별 소요 시간 측정 여부 (PERF_TRACE=1이면 측정 결과를 debug 로그로 출력, PLANNER_DEBUG와 함께 사용)
+_PERF_TRACE = os.getenv("PERF_TRACE") == "1"
+
+@contextmanager
+def _timed(label: str):
+    """PERF_TRACE가 켜져 있으면 블록 실행 시간을 debug 로그로 남깁니다"""
+    if not _PERF_TRACE:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.debug("[PERF] %s: %.1fms", label, (time.perf_counter() - started) * 1000)
+
+# OpenAI 비동기 클라이언트를 초기화합니다 (모든 요청에서 공유하여 이벤트 루프를 막지 않도록 await로 호출)
+client = openai.AsyncOpenAI(api_key=openai_api_key)
+
+# 카카오 로컬 서비스는 요청별 상태가 없으므로 모듈 로드 시 한 번만 생성해 재사용합니다
+kakao_service = KakaoLocalService()
 
 # ========================================
 # FastAPI 애플리케이션 생성
 # ========================================
 # FastAPI는 현대적인 Python 웹 프레임워크입니다
-app = FastAPI(title="여행 플래너 AI", version="1.0.0")
+app = FastAPI(title="여행 플래너 AI", version="1.0.0", default_response_class=ORJSONResponse)
 
 # ========================================
 # CORS 설정 (Cross-Origin Resource Sharing)
@@ -1400,261 +1472,323 @@ class TripPlan(BaseModel):
 # 여행 비용 계산 함수
 # ========================================
 
-def calculate_trip_cost(budget: str, travel_days: int, destination: str) -> int:
+# 여행 일수별 할인율 (인덱스 = 0~7로 제한한 여행 일수)
+# 1-2일: 할인 없음, 3-4일: 5% 할인, 5-6일: 10% 할인, 7일 이상: 15% 할인
+_DAY_DISCOUNT = (1.0, 1.0, 1.0, 0.95, 0.95, 0.9, 0.9, 0.85)
+
+# 예산 등급별 비용 배율 (키는 sys.intern으로 인터닝하여 조회 시 포인터 비교로 처리)
+_BUDGET_MULTIPLIERS = {
+    sys.intern("저예산"): 0.6,    # 60% 수준 (55,800원)
+    sys.intern("보통"): 1.0,      # 100% 기준 (93,000원)
+    sys.intern("고급"): 1.5,      # 150% 수준 (139,500원)
+    sys.intern("럭셔리"): 2.2     # 220% 수준 (204,600원)
+}
+
+# 지역별 기본 비용 조정 (서울 기준 1.0)
+_REGION_MULTIPLIERS = {
+    # 수도권
+    "서울": 1.3, "인천": 1.0, "경기": 1.0,
+    # 제주도 (관광지 프리미엄)
+    "제주": 1.2,
+    # 부산/대구 등 광역시
+    "부산": 1.1, "대구": 0.9, "광주": 0.9, "대전": 0.9, "울산": 0.9,
+    # 강원도 (관광지)
+    "강원": 1.0, "춘천": 1.0, "강릉": 1.1, "속초": 1.1, "평창": 1.0,
+    # 경상도
+    "경주": 0.9, "안동": 0.8, "포항": 0.9, "창원": 0.9, "진주": 0.8,
+    # 전라도
+    "전주": 0.8, "여수": 1.0, "순천": 0.8, "목포": 0.8,
+    # 충청도
+    "충주": 0.8, "천안": 0.9, "청주": 0.8, "공주": 0.8,
+    # 기타
+    "통영": 0.9, "거제": 0.9
+}
+
+# 지역명이 긴(더 구체적인) 순서로 정렬한 튜플 - 조기 종료 순회용
+_REGION_MULTIPLIER_ITEMS = tuple(sorted(_REGION_MULTIPLIERS.items(), key=lambda item: -len(item[0])))
+
+# 기본 일일 비용 (1인 기준) - 국내 여행 현실적 비용
+_BASE_DAILY_COST = {
+    "숙박": 35000,    # 평균 숙박비 (게스트하우스/모텔 기준)
+    "식사": 25000,    # 3끼 식사비 (아침 4천, 점심 10천, 저녁 11천)
+    "교통": 10000,    # 지역 내 교통비 (버스/지하철/택시)
+    "관광": 15000,    # 입장료, 체험비 등
+    "기타": 8000      # 쇼핑, 간식 등
+}
+
+# 총 기본 일일 비용
+_TOTAL_DAILY_COST = sum(_BASE_DAILY_COST.values())  # 93,000원
+
+# (예산 등급, 지역) 조합별 일일 비용표 - 모듈 로드 시 한 번만 계산
+# 지역을 찾지 못한 경우는 (예산 등급, None) 키로 지역 배율 1.0을 적용합니다
+_DAILY_COST_GRID = {
+    (budget, region): _TOTAL_DAILY_COST * budget_multiplier * region_multiplier
+    for budget, budget_multiplier in _BUDGET_MULTIPLIERS.items()
+    for region, region_multiplier in [*_REGION_MULTIPLIERS.items(), (None, 1.0)]
+}
+
+class TripCostBreakdown(NamedTuple):
+    """1인당 예상 비용 계산 결과 (화면에 세부 내역을 보여줄 때 재계산하지 않도록 함께 반환)"""
+    total: int                # 1인당 총 비용
+    daily: int                # 예산/지역 조정 후 일일 비용
+    region_multiplier: float  # 지역 배율
+    day_discount: float       # 여행 일수 할인율
+    
+    def __int__(self) -> int:
+        # 기존처럼 정수 비용이 필요한 곳에서는 int(...)로 사용할 수 있습니다
+        return self.total
+
+@lru_cache(maxsize=1024)  # 동일한 (예산, 일수, 목적지) 조합은 캐시된 결과를 재사용
+def calculate_trip_cost(budget: str, travel_days: int, destination: str) -> TripCostBreakdown:
     """예산 등급과 여행 일수에 따른 1인당 예상 비용을 계산합니다"""
     
     # 디버깅을 위한 로그
-    print(f"비용 계산 - 예산: {budget}, 여행일수: {travel_days}, 목적지: {destination}")
-    
-    # 기본 일일 비용 (숙박 + 식사 + 교통 + 관광)
-    budget_multipliers = {
-        "저예산": 0.6,    # 60% 수준 (55,800원)
-        "보통": 1.0,      # 100% 기준 (93,000원)
-        "고급": 1.5,      # 150% 수준 (139,500원)
-        "럭셔리": 2.2     # 220% 수준 (204,600원)
-    }
-    
-    # 지역별 기본 비용 조정 (서울 기준 1.0)
-    region_multipliers = {
-        # 수도권
-        "서울": 1.3, "인천": 1.0, "경기": 1.0,
-        # 제주도 (관광지 프리미엄)
-        "제주": 1.2,
-        # 부산/대구 등 광역시
-        "부산": 1.1, "대구": 0.9, "광주": 0.9, "대전": 0.9, "울산": 0.9,
-        # 강원도 (관광지)
-        "강원": 1.0, "춘천": 1.0, "강릉": 1.1, "속초": 1.1, "평창": 1.0,
-        # 경상도
-        "경주": 0.9, "안동": 0.8, "포항": 0.9, "창원": 0.9, "진주": 0.8,
-        # 전라도
-        "전주": 0.8, "여수": 1.0, "순천": 0.8, "목포": 0.8,
-        # 충청도
-        "충주": 0.8, "천안": 0.9, "청주": 0.8, "공주": 0.8,
-        # 기타
-        "통영": 0.9, "거제": 0.9
-    }
-    
-    # 기본 일일 비용 (1인 기준) - 국내 여행 현실적 비용
-    base_daily_cost = {
-        "숙박": 35000,    # 평균 숙박비 (게스트하우스/모텔 기준)
-        "식사": 25000,    # 3끼 식사비 (아침 4천, 점심 10천, 저녁 11천)
-        "교통": 10000,    # 지역 내 교통비 (버스/지하철/택시)
-        "관광": 15000,    # 입장료, 체험비 등
-        "기타": 8000      # 쇼핑, 간식 등
-    }
-    
-    # 총 기본 일일 비용
-    total_daily_cost = sum(base_daily_cost.values())  # 93,000원
+    if _DEBUG:
+        logger.debug("비용 계산 - 예산: %s, 여행일수: %d, 목적지: %s", budget, travel_days, destination)
     
-    # 예산 등급별 비용 조정
-    budget_adjusted_cost = total_daily_cost * budget_multipliers.get(budget, 1.0)
-    
-    # 지역별 비용 조정
-    region_multiplier = 1.0
-    destination_lower = destination.lower()
-    for region, multiplier in region_multipliers.items():
-        if region in destination_lower:
-            region_multiplier = multiplier
+    # 지역별 비용 조정 대상 지역 찾기
+    # 지역 키는 모두 한글이라 대소문자 구분이 없으므로 lower() 변환 없이 그대로 비교합니다
+    region_key = None
+    for region, _ in _REGION_MULTIPLIER_ITEMS:
+        if region in destination:
+            region_key = region
             break
     
-    # 최종 일일 비용
-    final_daily_cost = budget_adjusted_cost * region_multiplier
+    # 최종 일일 비용 (미리 계산된 예산 × 지역 비용표에서 조회)
+    final_daily_cost = _DAILY_COST_GRID.get((budget, region_key))
+    if final_daily_cost is None:
+        # 알 수 없는 예산 등급은 기본 배율(1.0)을 사용합니다
+        final_daily_cost = _TOTAL_DAILY_COST * 1.0 * _REGION_MULTIPLIERS.get(region_key, 1.0)
     
     # 여행 일수에 따른 할인 (장기 여행 시 일부 비용 절약)
-    if travel_days >= 7:
-        day_discount = 0.85  # 15% 할인 (장기 여행)
-    elif travel_days >= 5:
-        day_discount = 0.9   # 10% 할인 (중장기 여행)
-    elif travel_days >= 3:
-        day_discount = 0.95  # 5% 할인 (단기 여행)
-    else:
-        day_discount = 1.0   # 할인 없음 (1-2일)
+    day_discount = _DAY_DISCOUNT[max(0, min(travel_days, 7))]  # 0일 이하도 음수 인덱스 없이 할인 없음으로 처리
     
     # 최종 1인당 총 비용 계산
     total_cost = final_daily_cost * travel_days * day_discount
     
     # 디버깅을 위한 로그
-    print(f"=== 비용 계산 상세 ===")
-    print(f"일일 기본비용: {total_daily_cost:,}원")
-    print(f"예산 등급 ({budget}): {budget_multipliers.get(budget, 1.0)}배")
-    print(f"예산 조정후: {budget_adjusted_cost:,}원")
-    print(f"지역 ({destination}): {region_multiplier}배")
-    print(f"지역 조정후: {final_daily_cost:,}원")
-    print(f"여행 일수: {travel_days}일")
-    print(f"일수 할인: {day_discount}배")
-    print(f"최종 총비용: {total_cost:,}원")
-    print(f"1인당 일평균: {total_cost/travel_days:,.0f}원")
+    if _DEBUG:
+        logger.debug("=== 비용 계산 상세 ===")
+        logger.debug("일일 기본비용: %d원", _TOTAL_DAILY_COST)
+        logger.debug("예산 등급 (%s): %s배", budget, _BUDGET_MULTIPLIERS.get(budget, 1.0))
+        logger.debug("예산 조정후: %.0f원", _TOTAL_DAILY_COST * _BUDGET_MULTIPLIERS.get(budget, 1.0))
+        logger.debug("지역 (%s): %s배", destination, _REGION_MULTIPLIERS.get(region_key, 1.0))
+        logger.debug("지역 조정후: %.0f원", final_daily_cost)
+        logger.debug("여행 일수: %d일", travel_days)
+        logger.debug("일수 할인: %s배", day_discount)
+        logger.debug("최종 총비용: %.0f원", total_cost)
+        logger.debug("1인당 일평균: %.0f원", total_cost / travel_days)
     
-    return int(total_cost)
+    return TripCostBreakdown(
+        total=int(total_cost),
+        daily=int(final_daily_cost),
+        region_multiplier=_REGION_MULTIPLIERS.get(region_key, 1.0),
+        day_discount=day_discount
+    )
 
 
 
 
 
 # ========================================
-# 호텔 검색 서비스 클래스
+# 호텔 검색 및 예약 링크 생성 함수
 # ========================================
-# 이 클래스는 호텔 정보를 제공하고 예약 링크를 생성합니다
+# 호텔 예약 사이트의 검색 링크를 생성합니다
+
+# 예약 사이트별 검색 URL 템플릿 (모듈 로드 시 한 번만 생성)
+_BOOKING_URL_TEMPLATES = {
+    "hotels": "https://kr.hotels.com/Hotel-Search?destination={destination}&flexibility=0_DAY&d1={check_in}&startDate={check_in}&d2={check_out}&endDate={check_out}&adults={guests}&rooms={rooms}",
+    "airbnb": "https://www.airbnb.co.kr/s/{destination}/homes?checkin={check_in}&checkout={check_out}&adults={guests}&children=0&infants=0&pets=0",
+    "agoda": "https://www.agoda.com/ko-kr/search?textToSearch={destination}&checkIn={check_in}&checkOut={check_out}&rooms={rooms}&adults={guests}&children=0&locale=ko-kr&currency=KRW&travellerType=1",
+    "booking": "https://www.booking.com/searchresults.html?ss={destination}&checkin={check_in}&checkout={check_out}&group_adults={guests}&no_rooms={rooms}",
+}
+
+# 특정 호텔명이 있는 경우 사용하는 URL 템플릿
+_HOTEL_NAME_URL_TEMPLATES = {
+    "hotels": "https://kr.hotels.com/Hotel-Search?destination={destination}&flexibility=0_DAY&d1={check_in}&startDate={check_in}&d2={check_out}&endDate={check_out}&adults={guests}&rooms={rooms}&q={hotel_name}",
+    "agoda": "https://www.agoda.com/ko-kr/search?textToSearch={destination}&hotelName={hotel_name}&checkIn={check_in}&checkOut={check_out}&rooms={rooms}&adults={guests}&children=0&locale=ko-kr&currency=KRW&travellerType=1",
+    "booking": "https://www.booking.com/searchresults.html?ss={destination}&hotelName={hotel_name}&checkin={check_in}&checkout={check_out}&group_adults={guests}&no_rooms={rooms}",
+}
+
+# 호텔명 검색 시 사이트별 템플릿 (호텔명 템플릿이 없는 사이트는 기본 템플릿 사용, 사이트 순서는 기본과 동일)
+_NAMED_BOOKING_URL_TEMPLATES = {**_BOOKING_URL_TEMPLATES, **_HOTEL_NAME_URL_TEMPLATES}
+
+# 전체 여행 호텔 검색 URL 템플릿
+_TRIP_SEARCH_URL_TEMPLATES = {
+    "hotels": _BOOKING_URL_TEMPLATES["hotels"],
+    "yeogi": "https://www.yeogi.com/domestic-accommodations?keyword={destination}&checkIn={check_in}&checkOut={check_out}&personal={guests}&freeForm=false",
+    "booking": _BOOKING_URL_TEMPLATES["booking"],
+    "airbnb": _BOOKING_URL_TEMPLATES["airbnb"],
+}
+
+# 예약 사이트별 고정 정보 (이름, 아이콘) - 호출마다 URL만 채워서 사용합니다
+_BOOKING_SITE_INFO = {
+    "hotels": {"name": "호텔스닷컴", "icon": "🏨"},
+    "airbnb": {"name": "에어비앤비", "icon": "🏠"},
+    "agoda": {"name": "아고다", "icon": "🛏️"},
+    "booking": {"name": "부킹닷컴", "icon": "📅"},
+}
+
+# 전체 여행 호텔 검색 사이트별 고정 정보 (이름, 아이콘, 설명)
+_TRIP_SEARCH_SITE_INFO = {
+    "hotels": {"name": "호텔스닷컴", "icon": "🏨", "description": "호텔스닷컴에서 호텔 검색하기"},
+    "yeogi": {"name": "여기어때", "icon": "🏨", "description": "여기어때에서 호텔 검색하기"},
+    "booking": {"name": "부킹닷컴", "icon": "📅", "description": "부킹닷컴에서 호텔 검색하기"},
+    "airbnb": {"name": "에어비앤비", "icon": "🏠", "description": "에어비앤비에서 숙소 검색하기"},
+}
+
+# 자주 검색되는 목적지/호텔명의 URL 인코딩 결과를 캐싱합니다 (호텔명까지 담을 수 있도록 넉넉하게)
+_quote = lru_cache(maxsize=2048)(urllib.parse.quote)
+
+@lru_cache(maxsize=4096)
+def _booking_urls(destination: str, check_in: str, check_out: str, guests: int, rooms: int, hotel_name: str = "") -> tuple:
+    """사이트별 예약 URL을 (사이트, URL) 튜플로 만듭니다 (같은 조건은 캐시된 결과 재사용)"""
+    # 모든 예약 사이트가 YYYY-MM-DD 형식을 그대로 사용하므로 날짜 변환은 하지 않습니다
+    # URL 인코딩: 한글이나 특수문자를 URL에 안전하게 포함시키기 위한 처리 (목적지는 한 번만 인코딩)
+    # 날짜도 쿼리 파라미터로 들어온 문자열이므로 같은 방식으로 인코딩합니다 (정상 날짜는 그대로 유지)
+    params = {
+        "destination": _quote(destination),
+        "check_in": _quote(str(check_in)),
+        "check_out": _quote(str(check_out)),
+        "guests": guests,
+        "rooms": rooms,
+    }
+    
+    # 특정 호텔명이 있으면 처음부터 호텔명 템플릿을 사용해 사이트마다 URL을 한 번만 만듭니다
+    templates = _BOOKING_URL_TEMPLATES
+    if hotel_name:
+        params["hotel_name"] = _quote(hotel_name)
+        templates = _NAMED_BOOKING_URL_TEMPLATES
+    return tuple((site, template.format_map(params)) for site, template in templates.items())
+
+def create_booking_links(destination: str, check_in: str, check_out: str, guests: int, rooms: int, hotel_name: str = "") -> dict:
+    """각 호텔 예약 사이트의 검색 링크를 생성합니다"""
+    # 캐시된 URL로 매번 새 딕셔너리를 만들어 호출부에서 수정해도 캐시가 오염되지 않도록 합니다
+    return {
+        site: {**_BOOKING_SITE_INFO[site], "url": url}
+        for site, url in _booking_urls(destination, check_in, check_out, guests, rooms, hotel_name)
+    }
 
-class HotelSearchService:
-    """호텔 검색 및 예약 링크 생성 서비스"""
+@lru_cache(maxsize=256)
+def _trip_search_urls(destination: str, check_in: str, check_out: str, guests: int, rooms: int) -> tuple:
+    """사이트별 호텔 검색 URL을 (사이트, URL) 튜플로 만듭니다 (같은 조건은 캐시된 결과 재사용)"""
+    # 목적지와 날짜는 한 번만 URL 인코딩합니다
+    params = {
+        "destination": _quote(destination),
+        "check_in": _quote(str(check_in)),
+        "check_out": _quote(str(check_out)),
+        "guests": guests,
+        "rooms": rooms,
+    }
+    return tuple((site, template.format_map(params)) for site, template in _TRIP_SEARCH_URL_TEMPLATES.items())
+
+def create_trip_hotel_search_links(destination: str, check_in: str, check_out: str, guests: int, rooms: int) -> dict:
+    """전체 여행에 대한 호텔 검색 링크를 생성합니다"""
+    # 주요 호텔 예약 사이트들의 검색 링크 생성 (고정된 이름/아이콘/설명에 URL만 채움)
+    # 캐시된 URL로 매번 새 딕셔너리를 만들어 호출부에서 수정해도 캐시가 오염되지 않도록 합니다
+    search_links = {
+        site: {**_TRIP_SEARCH_SITE_INFO[site], "url": url}
+        for site, url in _trip_search_urls(destination, check_in, check_out, guests, rooms)
+    }
     
-    @staticmethod
-    def create_booking_links(destination: str, check_in: str, check_out: str, guests: int, rooms: int, hotel_name: str = "") -> dict:
-        """각 호텔 예약 사이트의 검색 링크를 생성하는 메서드"""
-        
-        # 날짜 형식을 변환합니다 (YYYY-MM-DD -> DD/MM/YYYY)
-        # 일부 예약 사이트는 다른 날짜 형식을 사용하기 때문입니다
-        try:
-            check_in_date = datetime.strptime(check_in, "%Y-%m-%d")
-            check_out_date = datetime.strptime(check_out, "%Y-%m-%d")
-            check_in_formatted = check_in_date.strftime("%d/%m/%Y")
-            check_out_formatted = check_out_date.strftime("%d/%m/%Y")
-        except:
-            # 날짜 변환에 실패하면 원본 형식을 그대로 사용합니다
-            check_in_formatted = check_in
-            check_out_formatted = check_out
-        
-        # URL 인코딩: 한글이나 특수문자를 URL에 안전하게 포함시키기 위한 처리
-        encoded_destination = urllib.parse.quote(destination)
-        encoded_hotel_name = urllib.parse.quote(hotel_name) if hotel_name else ""
-        
-        # 각 예약 사이트별 검색 링크를 생성합니다
-        links = {
-            "hotels": {
-                "name": "호텔스닷컴",
-                "url": f"https://kr.hotels.com/Hotel-Search?destination={encoded_destination}&flexibility=0_DAY&d1={check_in}&startDate={check_in}&d2={check_out}&endDate={check_out}&adults={guests}&rooms={rooms}",
-                "icon": "🏨"
-            },
-            "airbnb": {
-                "name": "에어비앤비",
-                "url": f"https://www.airbnb.co.kr/s/{encoded_destination}/homes?checkin={check_in}&checkout={check_out}&adults={guests}&children=0&infants=0&pets=0",
-                "icon": "🏠"
-            },
-            "agoda": {
-                "name": "아고다",
-                "url": f"https://www.agoda.com/ko-kr/search?textToSearch={encoded_destination}&checkIn={check_in}&checkOut={check_out}&rooms={rooms}&adults={guests}&children=0&locale=ko-kr&currency=KRW&travellerType=1",
-                "icon": "🛏️"
-            },
-            "booking": {
-                "name": "부킹닷컴",
-                "url": f"https://www.booking.com/searchresults.html?ss={encoded_destination}&checkin={check_in}&checkout={check_out}&group_adults={guests}&no_rooms={rooms}",
-                "icon": "📅"
-            }
-        }
-        
-        # 특정 호텔명이 있는 경우 더 구체적인 검색 링크를 생성합니다
-        if hotel_name:
-            links["hotels"]["url"] = f"https://kr.hotels.com/Hotel-Search?destination={encoded_destination}&flexibility=0_DAY&d1={check_in}&startDate={check_in}&d2={check_out}&endDate={check_out}&adults={guests}&rooms={rooms}&q={encoded_hotel_name}"
-            links["agoda"]["url"] = f"https://www.agoda.com/ko-kr/search?textToSearch={encoded_destination}&hotelName={encoded_hotel_name}&checkIn={check_in}&checkOut={check_out}&rooms={rooms}&adults={guests}&children=0&locale=ko-kr&currency=KRW&travellerType=1"
-            links["booking"]["url"] = f"https://www.booking.com/searchresults.html?ss={encoded_destination}&hotelName={encoded_hotel_name}&checkin={check_in}&checkout={check_out}&group_adults={guests}&no_rooms={rooms}"
-        
-        return links
-    
-    @staticmethod
-    def create_trip_hotel_search_links(destination: str, check_in: str, check_out: str, guests: int, rooms: int) -> dict:
-        """전체 여행에 대한 호텔 검색 링크를 생성하는 메서드"""
-        # 주요 호텔 예약 사이트들의 검색 링크 생성
-        search_links = {
-            "hotels": {
-                "name": "호텔스닷컴",
-                "url": f"https://kr.hotels.com/Hotel-Search?destination={urllib.parse.quote(destination)}&flexibility=0_DAY&d1={check_in}&startDate={check_in}&d2={check_out}&endDate={check_out}&adults={guests}&rooms={rooms}",
-                "icon": "🏨",
-                "description": "호텔스닷컴에서 호텔 검색하기"
-            },
-            "yeogi": {
-                "name": "여기어때",
-                "url": f"https://www.yeogi.com/domestic-accommodations?keyword={urllib.parse.quote(destination)}&checkIn={check_in}&checkOut={check_out}&personal={guests}&freeForm=false",
-                "icon": "🏨",
-                "description": "여기어때에서 호텔 검색하기"
-            },
-            "booking": {
-                "name": "부킹닷컴",
-                "url": f"https://www.booking.com/searchresults.html?ss={urllib.parse.quote(destination)}&checkin={check_in}&checkout={check_out}&group_adults={guests}&no_rooms={rooms}",
-                "icon": "📅",
-                "description": "부킹닷컴에서 호텔 검색하기"
-            },
-            "airbnb": {
-                "name": "에어비앤비",
-                "url": f"https://www.airbnb.co.kr/s/{urllib.parse.quote(destination)}/homes?checkin={check_in}&checkout={check_out}&adults={guests}&children=0&infants=0&pets=0",
-                "icon": "🏠",
-                "description": "에어비앤비에서 숙소 검색하기"
-            }
-        }
-        
-        return {
-            "destination": destination,
-            "check_in": check_in,
-            "check_out": check_out,
-            "guests": guests,
-            "rooms": rooms,
-            "search_links": search_links
-        }
+    return {
+        "destination": destination,
+        "check_in": check_in,
+        "check_out": check_out,
+        "guests": guests,
+        "rooms": rooms,
+        "search_links": search_links
+    }
+
+# 활동 텍스트에서 장소명을 추출하기 위한 관광지 접미사 (우선순위 순서)
+# 각 접미사는 "2글자 이상 한글 고유명사 + 접미사" 형태로 매칭합니다 (예: 해운대 + 해수욕장)
+_LOCATION_SUFFIXES = (
+    # 자연 관광지
+    '해수욕장',     # 해운대해수욕장, 경포해수욕장
+    '해변',         # 광안리해변, 경포해변
+    '폭포',         # 천지연폭포, 정방폭포
+    '산',           # 한라산, 지리산
+    '봉',           # 성산일출봉, 우도봉
+    '강',           # 한강, 낙동강
+    '호수',         # 천지호수, 밤섬호수
+    '굴',           # 만장굴, 협재굴
     
-    @staticmethod
-    def _extract_location_from_activity(activity_text: str, destination: str) -> str:
-        """활동 텍스트에서 주요 장소명을 추출하는 메서드"""
-        if not activity_text:
-            return destination
-        
-        # 구체적인 관광지 키워드 패턴 (2글자 이상 고유명사 + 접미사)
-        location_patterns = [
-            # 자연 관광지
-            r'([가-힣]{2,}해수욕장)',  # 해운대해수욕장, 경포해수욕장
-            r'([가-힣]{2,}해변)',      # 광안리해변, 경포해변
-            r'([가-힣]{2,}폭포)',      # 천지연폭포, 정방폭포
-            r'([가-힣]{2,}산)',        # 한라산, 지리산
-            r'([가-힣]{2,}봉)',        # 성산일출봉, 우도봉
-            r'([가-힣]{2,}강)',        # 한강, 낙동강
-            r'([가-힣]{2,}호수)',      # 천지호수, 밤섬호수
-            r'([가-힣]{2,}굴)',        # 만장굴, 협재굴
-            
-            # 문화/역사 관광지
-            r'([가-힣]{2,}사)',        # 불국사, 해인사, 조계사
-            r'([가-힣]{2,}궁)',        # 경복궁, 창덕궁, 덕수궁
-            r'([가-힣]{2,}성)',        # 수원화성, 남한산성
-            r'([가-힣]{2,}탑)',        # 남산타워, 부산타워
-            r'([가-힣]{2,}박물관)',    # 국립중앙박물관, 전쟁기념관
-            r'([가-힣]{2,}미술관)',    # 국립현대미술관, 리움미술관
-            r'([가-힣]{2,}문화재)',    # 석굴암문화재
-            
-            # 도시 인프라
-            r'([가-힣]{2,}시장)',      # 동대문시장, 남대문시장, 자갈치시장
-            r'([가-힣]{2,}공원)',      # 남산공원, 올림픽공원, 한강공원
-            r'([가-힣]{2,}역)',        # 서울역, 부산역, 제주공항
-            r'([가-힣]{2,}항)',        # 부산항, 인천항, 제주항
-            r'([가-힣]{2,}다리)',      # 광안대교, 한강대교, 반포대교
-            r'([가-힣]{2,}거리)',      # 명동거리, 홍대거리, 가로수길
-            r'([가-힣]{2,}로)',        # 청계천로, 강남대로
-            
-            # 행정구역 (구체적인 지명)
-            r'([가-힣]{2,}동)',        # 명동, 홍대동, 강남동
-            r'([가-힣]{2,}구)',        # 강남구, 종로구, 해운대구
-            r'([가-힣]{2,}시)',        # 부산시, 제주시, 강릉시
-            r'([가-힣]{2,}군)',        # 제주서귀포시, 강화군
-            r'([가-힣]{2,}읍)',        # 성산읍, 한림읍
-            r'([가-힣]{2,}면)',        # 애월면, 구좌면
-            
-            # 복합 명칭
-            r'([가-힣]{2,}테마파크)',  # 에버랜드테마파크, 롯데월드테마파크
-            r'([가-힣]{2,}리조트)',    # 제주신화월드리조트
-            r'([가-힣]{2,}아쿠아리움)', # 코엑스아쿠아리움
-            r'([가-힣]{2,}전망대)',    # 서울스카이전망대, 부산타워전망대
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, activity_text)
-            if match:
-                return match.group(1)
-        
-        # 특정 키워드가 없으면 전체 활동 텍스트에서 첫 번째 명사 추출
-        words = activity_text.split()
-        for word in words:
-            if len(word) >= 2 and re.match(r'^[가-힣]+$', word):
-                return word
-        
-        # 추출 실패 시 기본 목적지 반환
+    # 문화/역사 관광지
+    '사',           # 불국사, 해인사, 조계사
+    '궁',           # 경복궁, 창덕궁, 덕수궁
+    '성',           # 수원화성, 남한산성
+    '탑',           # 남산타워, 부산타워
+    '박물관',       # 국립중앙박물관, 전쟁기념관
+    '미술관',       # 국립현대미술관, 리움미술관
+    '문화재',       # 석굴암문화재
+    
+    # 도시 인프라
+    '시장',         # 동대문시장, 남대문시장, 자갈치시장
+    '공원',         # 남산공원, 올림픽공원, 한강공원
+    '역',           # 서울역, 부산역, 제주공항
+    '항',           # 부산항, 인천항, 제주항
+    '다리',         # 광안대교, 한강대교, 반포대교
+    '거리',         # 명동거리, 홍대거리, 가로수길
+    '로',           # 청계천로, 강남대로
+    
+    # 행정구역 (구체적인 지명)
+    '동',           # 명동, 홍대동, 강남동
+    '구',           # 강남구, 종로구, 해운대구
+    '시',           # 부산시, 제주시, 강릉시
+    '군',           # 제주서귀포시, 강화군
+    '읍',           # 성산읍, 한림읍
+    '면',           # 애월면, 구좌면
+    
+    # 복합 명칭
+    '테마파크',     # 에버랜드테마파크, 롯데월드테마파크
+    '리조트',       # 제주신화월드리조트
+    '아쿠아리움',   # 코엑스아쿠아리움
+    '전망대',       # 서울스카이전망대, 부산타워전망대
+)
+
+# 접미사의 첫 글자 집합 - 하나도 포함되지 않은 텍스트는 접미사 검색을 건너뜁니다
+_LOCATION_SUFFIX_CHARS = frozenset(suffix[0] for suffix in _LOCATION_SUFFIXES)
+
+# 연속된 한글 구간 패턴 (접미사 검색 대상)
+_HANGUL_RUN_PATTERN = re.compile(r'[가-힣]+')
+
+# 한글로만 이루어진 단어 패턴
+_HANGUL_WORD_PATTERN = re.compile(r'^[가-힣]+$')
+
+def _extract_location_from_activity(activity_text: str, destination: str) -> str:
+    """활동 텍스트에서 주요 장소명을 추출합니다"""
+    if not activity_text:
         return destination
+    
+    # 텍스트를 한 번만 훑어 한글 구간을 나눈 뒤, 접미사를 우선순위 순서대로 검사합니다
+    # (정규식 백트래킹 없이 str.rfind만 사용하므로 입력 길이에 선형적인 시간이 보장됩니다)
+    if not _LOCATION_SUFFIX_CHARS.isdisjoint(activity_text):
+        hangul_runs = _HANGUL_RUN_PATTERN.findall(activity_text)
+        for suffix in _LOCATION_SUFFIXES:
+            for run in hangul_runs:
+                # 접미사 앞에 최소 2글자가 있어야 하며, 가장 긴(마지막) 매칭을 사용합니다
+                suffix_idx = run.rfind(suffix, 2)
+                if suffix_idx != -1:
+                    return run[:suffix_idx + len(suffix)]
+    
+    # 특정 키워드가 없으면 전체 활동 텍스트에서 첫 번째 명사 추출
+    words = activity_text.split()
+    for word in words:
+        if len(word) >= 2 and _HANGUL_WORD_PATTERN.match(word):
+            return word
+    
+    # 추출 실패 시 기본 목적지 반환
+    return destination
+
+class HotelSearchService:
+    """호텔 검색 및 예약 링크 생성 서비스 (기존 호출부 호환을 위한 모듈 함수 묶음)"""
+    
+    create_booking_links = staticmethod(create_booking_links)
+    create_trip_hotel_search_links = staticmethod(create_trip_hotel_search_links)
+    _extract_location_from_activity = staticmethod(_extract_location_from_activity)
+
+# 호텔 검색 서비스 (상태가 없으므로 모든 요청에서 공유)
+hotel_service = HotelSearchService()
 
 # ========================================
 # API 엔드포인트 정의
@@ -1670,146 +1804,209 @@ async def root():
 # 진행 상황 SSE 엔드포인트
 # ========================================
 
-async def generate_progress_events(request_data: dict):
-    """여행 계획 생성 과정의 진행 상황을 실시간으로 전달하는 제너레이터"""
+# 진행 단계 정의: (단계, 메시지, 진행률, 다음 단계까지 대기 시간(초))
+_PROGRESS_STEPS = (
+    (1, '여행 정보를 검증하고 있습니다...', 8, 0.8),             # 1단계: 요청 검증
+    (2, '여행 데이터를 분석하고 있습니다...', 15, 1.0),          # 2단계: 데이터 전처리
+    (3, 'AI 시스템을 준비하고 있습니다...', 25, 1.2),            # 3단계: AI 시스템 준비
+    (4, '목적지 기본 정보를 수집하고 있습니다...', 35, 1.4),     # 4단계: 기본 정보 수집
+    (5, '관광지 데이터베이스를 조회하고 있습니다...', 45, 1.6),  # 5단계: 관광지 데이터베이스 조회
+    (6, '맞춤형 추천을 준비하고 있습니다...', 55, 1.2),          # 6단계: 맞춤형 추천 준비
+    (7, '여행 패턴을 분석하고 있습니다...', 65, 1.4),            # 7단계: 여행 패턴 분석
+    (8, '일정 최적화를 준비하고 있습니다...', 75, 1.0),          # 8단계: 일정 최적화 준비
+    (9, 'AI 모델을 로딩하고 있습니다...', 82, 0.8),              # 9단계: AI 모델 로딩
+    (10, '여행 계획 생성을 준비하고 있습니다...', 88, 0.8),      # 10단계: 최종 준비 단계
+    (11, 'AI가 여행 계획을 생성하고 있습니다...', 90, 0.8),      # 11단계: API 호출 직전
+)
+
+def _sse_frame(payload: dict) -> bytes:
+    """SSE 이벤트 한 개를 UTF-8 바이트 문자열로 만듭니다"""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+# 진행 상황 SSE 프레임은 내용이 고정되어 있으므로 모듈 로드 시 한 번만 직렬화합니다
+_PROGRESS_FRAMES = tuple(
+    (_sse_frame({'step': step, 'message': message, 'progress': progress, 'total_steps': len(_PROGRESS_STEPS)}), delay)
+    for step, message, progress, delay in _PROGRESS_STEPS
+)
+
+# 프록시가 유휴 연결을 끊지 않도록 보내는 SSE 주석 프레임과 전송 간격(초)
+_SSE_KEEPALIVE_FRAME = b": keepalive\n\n"
+_SSE_KEEPALIVE_INTERVAL = 15
+
+def _drain_deltas(deltas: asyncio.Queue, first: str) -> str:
+    """큐에 쌓여 있는 AI 응답 조각을 모두 꺼내 하나의 문자열로 합칩니다"""
+    if deltas.empty():
+        return first
+    parts = [first]
+    while not deltas.empty():
+        parts.append(deltas.get_nowait())
+    return "".join(parts)
+
+async def generate_progress_events(request: TripRequest, http_request: Optional[Request] = None) -> AsyncIterator[bytes]:
+    """여행 계획 생성 작업을 실행하면서 진행 상황, AI 응답 조각, 최종 결과를 실시간으로 전달하는 제너레이터"""
+    # 실제 여행 계획 생성을 스트림 시작과 동시에 백그라운드 작업으로 실행합니다
+    # AI 응답 조각은 큐를 통해 받아 바로 클라이언트로 전달합니다
+    deltas: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_run_plan(request, on_delta=deltas.put_nowait))
+    frames = iter(_PROGRESS_FRAMES)
+    delay = 0
+    next_delta = None
     try:
-        # 1단계: 요청 검증
-        yield f"data: {json.dumps({'step': 1, 'message': '여행 정보를 검증하고 있습니다...', 'progress': 8, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(0.8)
-        
-        # 2단계: 데이터 전처리
-        yield f"data: {json.dumps({'step': 2, 'message': '여행 데이터를 분석하고 있습니다...', 'progress': 15, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(1.0)
-        
-        # 3단계: AI 시스템 준비
-        yield f"data: {json.dumps({'step': 3, 'message': 'AI 시스템을 준비하고 있습니다...', 'progress': 25, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(1.2)
-        
-        # 4단계: 기본 정보 수집
-        yield f"data: {json.dumps({'step': 4, 'message': '목적지 기본 정보를 수집하고 있습니다...', 'progress': 35, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(1.4)
-        
-        # 5단계: 관광지 데이터베이스 조회
-        yield f"data: {json.dumps({'step': 5, 'message': '관광지 데이터베이스를 조회하고 있습니다...', 'progress': 45, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(1.6)
-        
-        # 6단계: 맞춤형 추천 준비
-        yield f"data: {json.dumps({'step': 6, 'message': '맞춤형 추천을 준비하고 있습니다...', 'progress': 55, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(1.2)
-        
-        # 7단계: 여행 패턴 분석
-        yield f"data: {json.dumps({'step': 7, 'message': '여행 패턴을 분석하고 있습니다...', 'progress': 65, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(1.4)
-        
-        # 8단계: 일정 최적화 준비
-        yield f"data: {json.dumps({'step': 8, 'message': '일정 최적화를 준비하고 있습니다...', 'progress': 75, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(1.0)
-        
-        # 9단계: AI 모델 로딩
-        yield f"data: {json.dumps({'step': 9, 'message': 'AI 모델을 로딩하고 있습니다...', 'progress': 82, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(0.8)
-        
-        # 10단계: 최종 준비 단계
-        yield f"data: {json.dumps({'step': 10, 'message': '여행 계획 생성을 준비하고 있습니다...', 'progress': 88, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(0.8)
+        while not task.done():
+            # 클라이언트 연결이 끊겼으면 더 기다리지 않고 종료합니다 (finally에서 작업 취소)
+            if http_request is not None and await http_request.is_disconnected():
+                logger.info("SSE 클라이언트 연결이 끊겨 여행 계획 생성을 중단합니다")
+                return
+            next_delta = asyncio.ensure_future(deltas.get())
+            done, _ = await asyncio.wait({task, next_delta}, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+            if next_delta in done:
+                # 클라이언트가 느려 조각이 쌓였으면 하나의 프레임으로 묶어 전달합니다
+                yield _sse_frame({'delta': _drain_deltas(deltas, next_delta.result())})
+                continue
+            next_delta.cancel()
+            if task in done:
+                break
+            # 응답 조각이 없는 동안에만 진행 프레임을 전달하고, 다 쓰면 연결 유지용 주석을 주기적으로 보냅니다
+            frame = next(frames, None)
+            if frame is None:
+                delay = _SSE_KEEPALIVE_INTERVAL
+                yield _SSE_KEEPALIVE_FRAME
+            else:
+                frame, delay = frame
+                yield frame
         
-        # 11단계: API 호출 직전
-        yield f"data: {json.dumps({'step': 11, 'message': 'AI가 여행 계획을 생성하고 있습니다...', 'progress': 90, 'total_steps': 11}, ensure_ascii=False)}\n\n"
-        await asyncio.sleep(0.8)
+        if not deltas.empty():
+            yield _sse_frame({'delta': _drain_deltas(deltas, deltas.get_nowait())})
         
-        # 실제 OpenAI API 호출은 plan-trip API에서 처리됨 - 여기서는 90%까지만
+        trip_plan = task.result()
+        yield _sse_frame({'completed': True, 'progress': 100, 'result': trip_plan.model_dump()})
         
+    except HTTPException as e:
+        yield _sse_frame({'error': e.detail})
     except Exception as e:
-        yield f"data: {json.dumps({'error': str(e)}, ensure_ascii=False)}\n\n"
+        yield _sse_frame({'error': str(e)})
+    finally:
+        # 클라이언트 연결이 끊기면 진행 중인 작업도 취소합니다
+        if not task.done():
+            task.cancel()
+        if next_delta is not None and not next_delta.done():
+            next_delta.cancel()
 
 @app.get("/plan-trip-progress")
 async def plan_trip_progress(
+    http_request: Request,
     destination: str,
     start_date: str,
     end_date: str,
     budget: str = "보통",
     guests: int = 2,
-    rooms: int = 1
+    rooms: int = 1,
+    interests: List[str] = Query(default=[]),
+    companionType: str = "",
+    travelStyle: str = "",
+    travelPace: str = ""
 ):
-    """여행 계획 생성 진행 상황을 실시간으로 전달하는 SSE 엔드포인트"""
-    request_data = {
-        'destination': destination,
-        'start_date': start_date,
-        'end_date': end_date,
-        'budget': budget,
-        'guests': guests,
-        'rooms': rooms
-    }
+    """여행 계획을 생성하면서 진행 상황과 최종 결과를 실시간으로 전달하는 SSE 엔드포인트"""
+    request = TripRequest(
+        destination=destination,
+        start_date=start_date,
+        end_date=end_date,
+        budget=budget,
+        interests=interests,
+        guests=guests,
+        companionType=companionType,
+        rooms=rooms,
+        travelStyle=travelStyle,
+        travelPace=travelPace
+    )
     
     return StreamingResponse(
-        generate_progress_events(request_data),
+        generate_progress_events(request, http_request),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-            "Access-Control-Allow-Headers": "*",
+            "X-Accel-Buffering": "no",  # 프록시(nginx 등)가 이벤트를 모아서 보내지 않도록 설정
+            # CORS 헤더는 CORSMiddleware가 처리합니다
         }
     )
 
-@app.post("/plan-trip", response_model=TripPlan)
-async def plan_trip(request: TripRequest):
-    """여행 계획을 생성하는 메인 API"""
-    try:
-        # 입력 데이터 검증
-        if not request.destination or request.destination.strip() == "":
-            raise HTTPException(status_code=400, detail="목적지를 입력해주세요.")
-        
-        if not request.start_date or request.start_date.strip() == "":
-            raise HTTPException(status_code=400, detail="여행 시작일을 선택해주세요.")
-        
-        if not request.end_date or request.end_date.strip() == "":
-            raise HTTPException(status_code=400, detail="여행 종료일을 선택해주세요.")
-        
-        # 날짜 형식 검증 및 파싱
-        try:
-            start_date = datetime.strptime(request.start_date, "%Y-%m-%d")
-            end_date = datetime.strptime(request.end_date, "%Y-%m-%d")
-        except ValueError:
-            raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식으로 입력해주세요.")
-        
-        # 날짜 논리 검증
-        if start_date >= end_date:
-            raise HTTPException(status_code=400, detail="여행 시작일은 종료일보다 이전이어야 합니다.")
-        
-        # 여행 기간 검증 (최대 4박 5일)
-        travel_days = (end_date - start_date).days + 1
-        if travel_days > 5:
-            raise HTTPException(status_code=400, detail="여행 기간은 최대 4박 5일까지 가능합니다.")
-        
-        if travel_days < 1:
-            raise HTTPException(status_code=400, detail="여행 기간은 최소 1일 이상이어야 합니다.")
-        
-        # 과거 날짜 검증
-        current_date = datetime.now().date()
-        if start_date.date() < current_date:
-            raise HTTPException(status_code=400, detail="여행 시작일은 오늘 이후 날짜여야 합니다.")
-        
-        # 로그에 요청 정보를 기록합니다
-        logger.info(f"여행 계획 생성 요청: {request.destination}, {request.start_date} ~ {request.end_date} ({travel_days}일)")
-        
-        # 호텔 검색 서비스를 초기화합니다
-        hotel_service = HotelSearchService()
-        
-        # 카카오 로컬 서비스를 초기화합니다
-        kakao_service = KakaoLocalService()
-        
-        # OpenAI API에 전달할 프롬프트(질문)를 생성합니다
-        # 프롬프트는 AI에게 무엇을 해달라고 요청하는 메시지입니다
-        prompt = f"""
-Destination: {request.destination}
-Travel period: {request.start_date} ~ {request.end_date} (total {travel_days} days)
-People: {request.guests}
-Rooms: {request.rooms}
-Budget: {request.budget}
-Interests: {', '.join(request.interests) if request.interests else 'general tourism'}
-Travel pace: {request.travelPace if request.travelPace else 'normal'}
+# 여행 계획 JSON 파싱 실패 시 사용하는 기본 일정 (여행 페이스별, {day}/{destination}은 요청 값으로 채워짐)
+_FALLBACK_ACTIVITIES = {
+    "타이트하게": (  # 하루 4개 활동
+        {"time": "09:00", "title": "{day}일차 오전 관광", "location": "{destination} 주요 관광지", "description": "주요 관광지 방문", "duration": "2시간"},
+        {"time": "12:00", "title": "점심 및 현지 명소", "location": "{destination} 맛집", "description": "현지 음식 체험 후 명소 탐방", "duration": "2시간"},
+        {"time": "15:00", "title": "오후 체험 활동", "location": "{destination} 체험장소", "description": "액티비티 참여", "duration": "2.5시간"},
+        {"time": "18:30", "title": "저녁 식사", "location": "{destination} 음식점", "description": "저녁 식사 및 휴식", "duration": "1.5시간"},
+    ),
+    "널널하게": (  # 하루 3개 활동
+        {"time": "10:00", "title": "{day}일차 여유로운 관광", "location": "{destination} 대표 관광지", "description": "천천히 둘러보며 여유있게 관광", "duration": "3시간"},
+        {"time": "15:00", "title": "점심 및 현지 체험", "location": "{destination} 유명 맛집", "description": "현지 특색 음식을 여유롭게 즐기고 문화 체험", "duration": "2.5시간"},
+        {"time": "19:00", "title": "저녁 식사 및 산책", "location": "{destination} 저녁 맛집", "description": "현지 음식을 즐기며 여유로운 저녁 산책", "duration": "2시간"},
+    ),
+    "보통": (  # 하루 3개 활동
+        {"time": "09:30", "title": "{day}일차 오전 관광", "location": "{destination} 주요 관광지", "description": "주요 관광지 방문", "duration": "2.5시간"},
+        {"time": "13:30", "title": "점심 및 오후 활동", "location": "{destination} 맛집", "description": "현지 음식 체험 후 오후 활동", "duration": "3시간"},
+        {"time": "18:00", "title": "저녁 식사", "location": "{destination} 음식점", "description": "저녁 식사 및 휴식", "duration": "1.5시간"},
+    ),
+}
+
+class _TTLCache:
+    """만료 시간이 있는 간단한 LRU 캐시 (최대 개수 초과 시 가장 오래 사용되지 않은 항목부터 제거)"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[object, tuple]" = OrderedDict()
+    
+    def get(self, key):
+        """만료되지 않은 값을 반환합니다 (없으면 None)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key, value) -> None:
+        """값을 저장합니다"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+# 동일한 요청에 대한 AI 여행 계획 캐시 (키: 프롬프트에 들어가는 요청 값, 24시간 유지, 최대 2048개)
+_plan_cache = _TTLCache(maxsize=2048, ttl=24 * 60 * 60)
+
+def _plan_cache_key(request: TripRequest, start_date: str, end_date: str) -> tuple:
+    """여행 계획 결과에 영향을 주는 요청 값으로 캐시 키를 만듭니다
+    
+    관심사는 순서와 중복, 문자열은 앞뒤 공백만 다른 요청이 같은 키를 갖도록 정규화합니다.
+    날짜는 요청 검증 단계에서 정규화한 YYYY-MM-DD 문자열을 받습니다.
+    """
+    return (
+        request.destination.strip(),
+        start_date,
+        end_date,
+        request.budget,
+        request.guests,
+        request.rooms,
+        tuple(sorted({interest.strip() for interest in request.interests or ()})),
+        (request.travelPace or "").strip(),
+    )
+
+# 여행 계획 생성 프롬프트 템플릿 (정적 텍스트가 대부분이므로 모듈 로드 시 한 번만 만들어 둡니다)
+_TRIP_PLAN_USER_PROMPT = Template("""
+Destination: ${destination}
+Travel period: ${start_date} ~ ${end_date} (total ${travel_days} days)
+People: ${guests}
+Rooms: ${rooms}
+Budget: ${budget}
+Interests: ${interests}
+Travel pace: ${travel_pace}
 
 Create a travel itinerary matching these conditions.
 
@@ -1865,23 +2062,23 @@ Create a travel itinerary matching these conditions.
 - **Cost related**: Actual costs or money-saving methods
 
 Respond in JSON format:
-{{
-    "destination": "{request.destination}",
-    "duration": "{travel_days}일",
+{
+    "destination": "${destination}",
+    "duration": "${travel_days}일",
     "itinerary": [
-        {{
+        {
             "day": 1,
-            "date": "{request.start_date}",
+            "date": "${start_date}",
             "activities": [
-                {{
+                {
                     "time": "09:00",
                     "title": "activity name (e.g., Haeundae walk)",
                     "location": "actual place name only (e.g., Haeundae Beach, Hajodae Beach)",
                     "description": "activity description",
                     "duration": "duration"
-                }}
+                }
             ]
-        }}
+        }
     ],
     "total_cost": "1인당 XXX,XXX원",
     "tips": [
@@ -1889,23 +2086,10 @@ Respond in JSON format:
         "Regional characteristics and precautions (e.g., 'Haeundae Beach is quiet before 9 AM')", 
         "Local transportation/food/culture info (e.g., 'Jagalchi Market is most lively after 2 PM')"
     ]
-}}
-        """
-        
-        logger.info("=== OpenAI API 호출 시작 ===")
-        logger.info(f"목적지: {request.destination}, 여행기간: {travel_days}일")
-        logger.info(f"모델: gpt-4o, 최대토큰: 3000, Temperature: 0.3")
-        
-        # 실제 OpenAI API 호출 시작 시점 기록
-        api_start_time = datetime.now()
-        logger.info(f"API 호출 시작 시간: {api_start_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
-        
-        # OpenAI API를 호출하여 AI 여행 계획을 생성합니다
-        # 최신 OpenAI API 사용법을 적용했습니다
-        response = client.chat.completions.create(
-            model="gpt-4o",  # 사용할 AI 모델
-            messages=[
-                {"role": "system", "content": f"""You are a professional travel planner. Create a {travel_days}-day travel plan.
+}
+""")
+
+_TRIP_PLAN_SYSTEM_PROMPT = Template("""You are a professional travel planner. Create a ${travel_days}-day travel plan.
 
 🚨 **TOP RULE: NO DUPLICATE PLACES**
 
@@ -1929,33 +2113,178 @@ Respond in JSON format:
 ✅ Use specific proper nouns
 ✅ Match travel pace activity count: Relaxed(3), Tight(4)
 ✅ Respond accurately in JSON format
-✅ **IMPORTANT: Write all titles and descriptions in Korean language**"""},
+✅ **IMPORTANT: Write all titles and descriptions in Korean language**""")
+
+@lru_cache(maxsize=None)
+def _trip_plan_system_prompt(travel_days: int) -> str:
+    """여행 일수별 시스템 프롬프트 (일수는 최대 5일이므로 몇 개만 만들어 재사용합니다)"""
+    return _TRIP_PLAN_SYSTEM_PROMPT.substitute(travel_days=travel_days)
+
+# AI가 팁을 만들지 못한 기본 계획에서 사용하는 여행 팁
+_FALLBACK_TIPS = ("여행 전 날짜 확인", "필수품 준비", "현지 교통 정보 파악", "현지 문화와 예의를 미리 알아보세요")
+
+@lru_cache(maxsize=512)
+def _build_fallback_plan(destination: str, start_date: date, end_date: date, travel_days: int,
+                         guests: int, rooms: int, budget: str, travel_pace: str) -> dict:
+    """AI 응답을 파싱하지 못했을 때 사용할 기본 여행 계획을 만듭니다 (같은 조건은 캐시된 결과 재사용)"""
+    # 여행 페이스에 따른 기본 활동 (타이트하게: 4개, 널널하게/보통: 3개)
+    # 목적지는 요청마다 고정이므로 한 번만 채우고, 일차별로는 제목의 {day}만 채웁니다
+    activity_templates = [
+        {key: value.replace("{destination}", destination) for key, value in template.items()}
+        for template in _FALLBACK_ACTIVITIES.get(travel_pace, _FALLBACK_ACTIVITIES["보통"])
+    ]
+    accommodation = f"{destination} 추천 호텔"
+    
+    # 여행 기간에 맞는 일정을 생성합니다 (새로운 activities 구조)
+    # 날짜 문자열은 한 번에 ISO 형식(YYYY-MM-DD)으로 만들어 둡니다 (strftime 포맷 해석 생략)
+    iso_dates = [(start_date + timedelta(days=offset)).isoformat() for offset in range(travel_days)]
+    itinerary_list = [
+        {
+            "day": day,
+            "date": iso_date,
+            "activities": [{**template, "title": template["title"].format(day=day)} for template in activity_templates],
+            "accommodation": accommodation
+        }
+        for day, iso_date in enumerate(iso_dates, 1)
+    ]
+    
+    # 전체 여행에 대한 호텔 검색 링크를 생성합니다
+    trip_hotel_search = create_trip_hotel_search_links(destination, start_date.isoformat(), end_date.isoformat(), guests, rooms)
+    
+    # 1인당 예상 비용 계산 (예산 등급별 세부 계산)
+    estimated_cost_per_person = calculate_trip_cost(budget, travel_days, destination).total
+    
+    return {
+        "destination": destination,
+        "duration": f"{travel_days}일",
+        "itinerary": itinerary_list,
+        "total_cost": f"1인당 {estimated_cost_per_person:,}원",
+        "tips": list(_FALLBACK_TIPS),
+        "trip_hotel_search": trip_hotel_search
+    }
+
+def _parse_trip_date(value: str) -> date:
+    """YYYY-MM-DD 형식의 날짜 문자열만 date로 변환합니다 (다른 형식이면 ValueError)"""
+    # date.fromisoformat은 '20251001', '2025-W40-3' 같은 다른 ISO 형식도 받아들이므로 자릿수와 구분자를 먼저 확인합니다
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"YYYY-MM-DD 형식이 아닙니다: {value!r}")
+    return date.fromisoformat(value)
+
+async def _run_plan(request: TripRequest, on_delta: Optional[Callable[[str], None]] = None) -> TripPlan:
+    """여행 계획을 생성하는 본체 (POST /plan-trip과 SSE 진행 스트림이 함께 사용)
+    
+    on_delta가 주어지면 OpenAI 응답 조각(토큰)을 받는 즉시 전달합니다.
+    """
+    try:
+        # 입력 데이터 검증
+        if not request.destination or request.destination.strip() == "":
+            raise HTTPException(status_code=400, detail="목적지를 입력해주세요.")
+        
+        if not request.start_date or request.start_date.strip() == "":
+            raise HTTPException(status_code=400, detail="여행 시작일을 선택해주세요.")
+        
+        if not request.end_date or request.end_date.strip() == "":
+            raise HTTPException(status_code=400, detail="여행 종료일을 선택해주세요.")
+        
+        # 날짜 형식 검증 및 파싱 (TripRequest는 날짜를 문자열로 받고 여기서 한 번만 파싱합니다.
+        # 모델 필드/검증기로 옮기면 한국어 메시지의 400 응답이 FastAPI 기본 422 응답으로 바뀌므로 여기서 처리합니다)
+        try:
+            start_date = _parse_trip_date(request.start_date)
+            end_date = _parse_trip_date(request.end_date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식으로 입력해주세요.")
+        
+        # 날짜 논리 검증
+        if start_date >= end_date:
+            raise HTTPException(status_code=400, detail="여행 시작일은 종료일보다 이전이어야 합니다.")
+        
+        # 여행 기간 검증 (최대 4박 5일)
+        travel_days = (end_date - start_date).days + 1
+        if travel_days > 5:
+            raise HTTPException(status_code=400, detail="여행 기간은 최대 4박 5일까지 가능합니다.")
+        
+        # 과거 날짜 검증
+        if start_date < date.today():
+            raise HTTPException(status_code=400, detail="여행 시작일은 오늘 이후 날짜여야 합니다.")
+        
+        # 이후 단계(프롬프트, 캐시 키, 호텔 검색 링크)에는 파싱한 날짜로 만든 문자열을 사용합니다
+        start_iso = start_date.isoformat()
+        end_iso = end_date.isoformat()
+        
+        # 예산 등급은 몇 가지 고정 값이므로 요청 경계에서 한 번만 인터닝해 비용 배율 조회가 포인터 비교로 끝나게 합니다
+        budget = sys.intern(request.budget) if request.budget else request.budget
+        
+        # 로그에 요청 정보를 기록합니다
+        logger.info("여행 계획 생성 요청: %s, %s ~ %s (%d일)", request.destination, start_iso, end_iso, travel_days)
+        
+        # 같은 조건으로 최근에 생성한 여행 계획이 있으면 OpenAI 호출 없이 바로 반환합니다
+        cache_key = _plan_cache_key(request, start_iso, end_iso)
+        cached_plan = _plan_cache.get(cache_key)
+        if cached_plan is not None:
+            logger.info("캐시된 여행 계획을 반환합니다")
+            return cached_plan
+        
+        # OpenAI API에 전달할 프롬프트(질문)를 생성합니다
+        # 프롬프트는 AI에게 무엇을 해달라고 요청하는 메시지입니다
+        prompt = _TRIP_PLAN_USER_PROMPT.substitute(
+            destination=request.destination,
+            start_date=start_iso,
+            end_date=end_iso,
+            travel_days=travel_days,
+            guests=request.guests,
+            rooms=request.rooms,
+            budget=budget,
+            interests=', '.join(request.interests) if request.interests else 'general tourism',
+            travel_pace=request.travelPace if request.travelPace else 'normal'
+        )
+        
+        logger.info("=== OpenAI API 호출 시작 ===")
+        logger.info("목적지: %s, 여행기간: %d일", request.destination, travel_days)
+        logger.info("모델: gpt-4o, 최대토큰: 3000, Temperature: 0.3")
+        
+        # 실제 OpenAI API 호출 시작 시점 기록
+        api_start_time = datetime.now()
+        logger.info("API 호출 시작 시간: %s", api_start_time)
+        
+        # OpenAI API를 호출하여 AI 여행 계획을 생성합니다
+        # 응답을 스트리밍으로 받아 생성되는 즉시 조각을 전달합니다
+        stream = await client.chat.completions.create(
+            model="gpt-4o",  # 사용할 AI 모델
+            messages=[
+                {"role": "system", "content": _trip_plan_system_prompt(travel_days)},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=3000,  # AI 응답의 최대 길이 (더 긴 응답을 위해 증가)
-            temperature=0.3   # AI의 창의성 수준을 낮춰 더 일관되고 규칙을 잘 따르도록 설정
+            temperature=0.3,  # AI의 창의성 수준을 낮춰 더 일관되고 규칙을 잘 따르도록 설정
+            stream=True
         )
+        content_parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                content_parts.append(delta)
+                if on_delta is not None:
+                    on_delta(delta)
         
         # API 호출 완료 시점 기록
         api_end_time = datetime.now()
         api_duration = (api_end_time - api_start_time).total_seconds()
-        logger.info(f"=== OpenAI API 응답 수신 완료 ===")
-        logger.info(f"API 호출 완료 시간: {api_end_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
-        logger.info(f"API 응답 소요 시간: {api_duration:.2f}초")
+        logger.info("=== OpenAI API 응답 수신 완료 ===")
+        logger.info("API 호출 완료 시간: %s", api_end_time)
+        logger.info("API 응답 소요 시간: %.2f초", api_duration)
         
         # AI 응답을 파싱(분석)합니다
-        content = response.choices[0].message.content
-        logger.info(f"AI 응답 내용: {content[:200]}...")
+        content = "".join(content_parts)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("AI 응답 내용: %s...", content[:200])
         
         # JSON 응답을 추출하려고 시도합니다
         try:
-            # JSON 부분만 추출 (AI가 때로는 설명과 함께 JSON을 반환하기 때문)
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx]
-                logger.info(f"추출된 JSON: {json_str}")
-                trip_data = json.loads(json_str)
+            # JSON 객체 파싱 (AI가 때로는 설명과 함께 JSON을 반환하기 때문)
+            trip_data = _parse_json_object(content)
+            if trip_data is not None:
                 
                 # 중복 장소 제거
                 logger.info("중복 장소 검사를 시작합니다...")
@@ -1965,24 +2294,25 @@ Respond in JSON format:
                 logger.info("중복 제거 후 최종 검증을 시작합니다...")
                 final_duplicates = await check_final_duplicates(trip_data)
                 if final_duplicates:
-                    logger.warning(f"최종 검증에서 여전히 중복 발견: {final_duplicates}")
+                    logger.warning("최종 검증에서 여전히 중복 발견: %s", final_duplicates)
                     # 추가 중복 제거 시도
                     trip_data = await remove_duplicate_locations(trip_data, request.destination)
                 
-                # 카카오 API로 장소 검증 및 보강
+                # 카카오 API로 장소 검증 및 보강 (검증이 진행되는 동안 호텔 검색 링크를 만듭니다)
                 logger.info("카카오 API를 사용하여 장소 검증을 시작합니다...")
-                trip_data = await verify_and_enrich_trip_data(trip_data, kakao_service, request.destination)
+                verify_task = asyncio.create_task(verify_and_enrich_trip_data(trip_data, kakao_service, request.destination))
                 
                 # 숙박 정보는 trip_hotel_search 링크로만 제공하므로 accommodation 처리 생략
                 
                 # 전체 여행에 대한 호텔 검색 링크를 생성합니다
-                trip_hotel_search = hotel_service.create_trip_hotel_search_links(
+                trip_hotel_search = create_trip_hotel_search_links(
                     request.destination, 
-                    request.start_date, 
-                    request.end_date,
+                    start_iso, 
+                    end_iso,
                     request.guests,
                     request.rooms
                 )
+                trip_data = await verify_task
                 trip_data["trip_hotel_search"] = trip_hotel_search
                 
                 # 위치 검증 수행 (선택적) - 1일차 일정 누락 문제로 임시 비활성화
@@ -1997,14 +2327,14 @@ Respond in JSON format:
                         
                         # 검증 결과가 좋지 않은 경우 경고 로그
                         if validation_result['invalid_places_count'] > 0:
-                            logger.warning(f"위치 검증 결과: {validation_result['invalid_places_count']}개의 장소를 찾을 수 없습니다")
-                            logger.warning(f"문제 장소들: {[p['location'] for p in validation_result['invalid_places']]}")
+                            logger.warning("위치 검증 결과: %d개의 장소를 찾을 수 없습니다", validation_result['invalid_places_count'])
+                            logger.warning("문제 장소들: %s", [p['location'] for p in validation_result['invalid_places']])
                         
                         # 검증 결과를 응답에 포함 (개발용)
                         trip_data["location_validation"] = validation_result
                         
                     except Exception as e:
-                        logger.error(f"기존 위치 검증 중 오류: {e}")
+                        logger.error("기존 위치 검증 중 오류: %s", e)
                 
                 # 지오코딩 검증 비활성화 (카카오 API만 사용)
                 logger.info("지오코딩 검증이 비활성화되어 있습니다. 카카오 API만 사용합니다.")
@@ -2016,118 +2346,45 @@ Respond in JSON format:
                 if "tips" in trip_data and isinstance(trip_data["tips"], list):
                     trip_data["tips"] = trip_data["tips"][:4]
                 
-                # TripPlan 모델로 변환하여 반환합니다
-                return TripPlan(**trip_data)
+                # TripPlan 모델로 변환하고 캐시에 저장한 뒤 반환합니다
+                trip_plan = TripPlan.model_validate(trip_data)
+                _plan_cache.set(cache_key, trip_plan)
+                return trip_plan
             else:
                 logger.warning("JSON 응답을 찾을 수 없습니다")
                 raise ValueError("JSON 응답을 찾을 수 없습니다")
                 
         except json.JSONDecodeError as e:
             # JSON 파싱에 실패한 경우 기본 응답을 생성합니다
-            logger.warning(f"JSON 파싱 실패: {e}")
-            
-            # 실제 호텔 정보를 가져옵니다
-            popular_hotels = hotel_service.get_popular_hotels(request.destination)
-            
-            # 실제 호텔 정보로 기본 응답을 생성합니다
-            accommodation_list = []
-            for hotel in popular_hotels[:2]:  # 상위 2개 호텔만 사용
-                hotel_info = HotelInfo(
-                    name=hotel["name"],
-                    type=hotel["type"],
-                    price_range=hotel["price_range"],
-                    booking_links=hotel_service.create_booking_links(
-                        request.destination,
-                        request.start_date,
-                        request.end_date,
-                        request.guests,
-                        request.rooms,
-                        hotel["name"]
-                    ),
-                    description=hotel["description"],
-                    rating=hotel["rating"],
-                    amenities=hotel["amenities"]
-                )
-                accommodation_list.append(hotel_info)
-            
-            # 여행 기간에 맞는 일정을 생성합니다 (새로운 activities 구조)
-            itinerary_list = []
-            for day in range(1, travel_days + 1):
-                current_date = start_date + timedelta(days=day - 1)
-                
-                # 여행 페이스에 따른 활동 수 결정
-                if request.travelPace == "타이트하게":
-                    # 하루 4개 활동
-                    activities = [
-                        {"time": "09:00", "title": f"{day}일차 오전 관광", "location": f"{request.destination} 주요 관광지", "description": "주요 관광지 방문", "duration": "2시간"},
-                        {"time": "12:00", "title": f"점심 및 현지 명소", "location": f"{request.destination} 맛집", "description": "현지 음식 체험 후 명소 탐방", "duration": "2시간"},
-                        {"time": "15:00", "title": f"오후 체험 활동", "location": f"{request.destination} 체험장소", "description": "액티비티 참여", "duration": "2.5시간"},
-                        {"time": "18:30", "title": f"저녁 식사", "location": f"{request.destination} 음식점", "description": "저녁 식사 및 휴식", "duration": "1.5시간"}
-                    ]
-                elif request.travelPace == "널널하게":
-                    # 하루 3개 활동
-                    activities = [
-                        {"time": "10:00", "title": f"{day}일차 여유로운 관광", "location": f"{request.destination} 대표 관광지", "description": "천천히 둘러보며 여유있게 관광", "duration": "3시간"},
-                        {"time": "15:00", "title": f"점심 및 현지 체험", "location": f"{request.destination} 유명 맛집", "description": "현지 특색 음식을 여유롭게 즐기고 문화 체험", "duration": "2.5시간"},
-                        {"time": "19:00", "title": f"저녁 식사 및 산책", "location": f"{request.destination} 저녁 맛집", "description": "현지 음식을 즐기며 여유로운 저녁 산책", "duration": "2시간"}
-                    ]
-                else:  # 보통
-                    # 하루 3개 활동
-                    activities = [
-                        {"time": "09:30", "title": f"{day}일차 오전 관광", "location": f"{request.destination} 주요 관광지", "description": "주요 관광지 방문", "duration": "2.5시간"},
-                        {"time": "13:30", "title": f"점심 및 오후 활동", "location": f"{request.destination} 맛집", "description": "현지 음식 체험 후 오후 활동", "duration": "3시간"},
-                        {"time": "18:00", "title": f"저녁 식사", "location": f"{request.destination} 음식점", "description": "저녁 식사 및 휴식", "duration": "1.5시간"}
-                    ]
-                
-                itinerary_list.append({
-                    "day": day,
-                    "date": current_date.strftime("%Y-%m-%d"),
-                    "activities": activities,
-                    "accommodation": f"{request.destination} 추천 호텔"
-                })
+            logger.warning("JSON 파싱 실패: %s", e)
             
-            # 전체 여행에 대한 호텔 검색 링크를 생성합니다
-            trip_hotel_search = hotel_service.create_trip_hotel_search_links(
-                request.destination, 
-                request.start_date, 
-                request.end_date,
+            # 같은 조건의 기본 계획은 캐시된 결과로 다시 검증만 해서 반환합니다
+            return TripPlan.model_validate(_build_fallback_plan(
+                request.destination,
+                start_date,
+                end_date,
+                travel_days,
                 request.guests,
-                request.rooms
-            )
-            
-            # 대중교통 정보는 제거됨
-            
-            # 여행 기간 계산 (실제 여행 일수)
-            start_date = datetime.strptime(request.start_date, "%Y-%m-%d")
-            end_date = datetime.strptime(request.end_date, "%Y-%m-%d")
-            travel_days = (end_date - start_date).days + 1  # 실제 여행 일수 (2박3일 = 3일)
-            
-            # 1인당 예상 비용 계산 (예산 등급별 세부 계산)
-            estimated_cost_per_person = calculate_trip_cost(request.budget, travel_days, request.destination)
-            
-            # AI가 생성한 여행 팁을 사용하고 최대 4개로 제한
-            ai_tips = trip_data.get("tips", [])
-            if isinstance(ai_tips, list) and len(ai_tips) > 0:
-                # 최대 4개까지만 사용
-                limited_tips = ai_tips[:4]
-            else:
-                # AI가 팁을 생성하지 않은 경우 기본 팁 사용
-                limited_tips = ["여행 전 날짜 확인", "필수품 준비", "현지 교통 정보 파악", "현지 문화와 예의를 미리 알아보세요"]
-            
-            return TripPlan(
-                destination=request.destination,
-                duration=f"{travel_days}일",
-                itinerary=itinerary_list,
-                total_cost=f"1인당 {estimated_cost_per_person:,}원",
-                tips=limited_tips,
-                trip_hotel_search=trip_hotel_search
-            )
+                request.rooms,
+                budget,
+                request.travelPace
+            ))
             
+    except HTTPException:
+        # 입력 검증 오류(400)는 500으로 바꾸지 않고 그대로 전달합니다
+        raise
     except Exception as e:
         # 에러가 발생한 경우 로그에 기록하고 HTTP 에러를 반환합니다
-        logger.error(f"여행 계획 생성 중 오류 발생: {str(e)}", exc_info=True)
+        logger.error("여행 계획 생성 중 오류 발생: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"여행 계획 생성 중 오류가 발생했습니다: {str(e)}")
 
+@app.post("/plan-trip", response_model=TripPlan)
+async def plan_trip(request: TripRequest):
+    """여행 계획을 생성하는 메인 API"""
+    trip_plan = await _run_plan(request)
+    # 이미 검증된 TripPlan이므로 응답 모델 재검증과 jsonable_encoder 변환 없이 pydantic 직렬화기로 바로 JSON을 만듭니다
+    return Response(content=trip_plan.model_dump_json(), media_type="application/json")
+
 @app.get("/hotel-links")
 async def get_hotel_links(
     destination: str,
@@ -2138,8 +2395,7 @@ async def get_hotel_links(
 ):
     """특정 조건에 맞는 호텔 검색 링크를 생성하는 API"""
     try:
-        hotel_service = HotelSearchService()
-        links = hotel_service.create_booking_links(destination, check_in, check_out, guests, rooms)
+        links = create_booking_links(destination, check_in, check_out, guests, rooms)
         return {
             "destination": destination,
             "check_in": check_in,
@@ -2149,24 +2405,14 @@ async def get_hotel_links(
             "booking_links": links
         }
     except Exception as e:
-        logger.error(f"호텔 링크 생성 중 오류 발생: {str(e)}")
+        logger.error("호텔 링크 생성 중 오류 발생: %s", e)
         raise HTTPException(status_code=500, detail=f"호텔 링크 생성 중 오류가 발생했습니다: {str(e)}")
 
 @app.get("/popular-hotels/{destination}")
 async def get_popular_hotels(destination: str):
-    """특정 목적지의 인기 호텔 정보를 조회하는 API"""
-    try:
-        hotel_service = HotelSearchService()
-        hotels = hotel_service.get_popular_hotels(destination)
-        return {
-            "destination": destination,
-            "hotels": hotels
-        }
-    except Exception as e:
-        logger.error(f"인기 호텔 정보 조회 중 오류 발생: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"인기 호텔 정보 조회 중 오류가 발생했습니다: {str(e)}")
-
-
+    """특정 목적지의 인기 호텔 정보를 조회하는 API (인기 호텔 데이터 소스가 없어 지원하지 않음)"""
+    # HotelSearchService에는 인기 호텔 데이터가 없으므로 빈 목록 대신 미지원임을 명확히 알립니다
+    raise HTTPException(status_code=501, detail="인기 호텔 조회는 지원하지 않습니다. 호텔 검색 링크는 /hotel-links를 이용해주세요.")
 
 @app.get("/hotel-search")
 async def search_hotels(
@@ -2177,36 +2423,9 @@ async def search_hotels(
     rooms: int = 1,
     hotel_name: str = ""
 ):
-    """호텔 검색 및 예약 링크를 생성하는 통합 API"""
-    try:
-        hotel_service = HotelSearchService()
-        
-        # 인기 호텔 정보를 가져옵니다
-        popular_hotels = hotel_service.get_popular_hotels(destination)
-        
-        # 각 호텔에 예약 링크를 추가합니다
-        for hotel in popular_hotels:
-            hotel["booking_links"] = hotel_service.create_booking_links(
-                destination, check_in, check_out, guests, rooms, hotel["name"]
-            )
-        
-        # 일반적인 검색 링크도 제공합니다
-        general_links = hotel_service.create_booking_links(
-            destination, check_in, check_out, guests, rooms, hotel_name
-        )
-        
-        return {
-            "destination": destination,
-            "check_in": check_in,
-            "check_out": check_out,
-            "guests": guests,
-            "rooms": rooms,
-            "popular_hotels": popular_hotels,
-            "general_search_links": general_links
-        }
-    except Exception as e:
-        logger.error(f"호텔 검색 중 오류 발생: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"호텔 검색 중 오류가 발생했습니다: {str(e)}")
+    """호텔 검색 및 예약 링크를 생성하는 통합 API (인기 호텔 데이터 소스가 없어 지원하지 않음)"""
+    # 인기 호텔 목록에 의존하는 API이므로 /popular-hotels와 마찬가지로 미지원임을 알립니다
+    raise HTTPException(status_code=501, detail="호텔 통합 검색은 지원하지 않습니다. 호텔 검색 링크는 /hotel-links를 이용해주세요.")
 
 @app.get("/health")
 async def health_check():
@@ -2232,8 +2451,12 @@ class TripFeedback(BaseModel):
     duration: str  # 여행 기간
     timestamp: Optional[str] = None  # 제출 시간
 
+# 피드백 파일(trip_feedbacks.json) 읽기-쓰기 잠금
+# (아래 피드백 엔드포인트는 동기 파일 I/O를 하므로 def로 선언해 스레드풀에서 실행)
+_feedback_lock = threading.Lock()
+
 @app.post("/submit-feedback")
-async def submit_feedback(feedback: TripFeedback):
+def submit_feedback(feedback: TripFeedback):
     """여행 계획 평가 피드백을 수집하는 API"""
     try:
         # 현재 시간을 타임스탬프로 설정
@@ -2254,22 +2477,24 @@ async def submit_feedback(feedback: TripFeedback):
         # 피드백 파일 경로
         feedback_file = "trip_feedbacks.json"
         
-        # 기존 피드백 데이터 로드
-        try:
-            with open(feedback_file, 'r', encoding='utf-8') as f:
-                existing_feedbacks = json.load(f)
-        except FileNotFoundError:
-            existing_feedbacks = []
-        
-        # 새 피드백 추가
-        existing_feedbacks.append(feedback_data)
-        
-        # 파일에 저장
-        with open(feedback_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_feedbacks, f, ensure_ascii=False, indent=2)
+        # 스레드풀에서 동시에 실행될 수 있으므로 읽기-추가-쓰기를 잠금으로 보호
+        with _feedback_lock:
+            # 기존 피드백 데이터 로드
+            try:
+                with open(feedback_file, 'rb') as f:
+                    existing_feedbacks = orjson.loads(f.read())
+            except FileNotFoundError:
+                existing_feedbacks = []
+            
+            # 새 피드백 추가
+            existing_feedbacks.append(feedback_data)
+            
+            # 파일에 저장
+            with open(feedback_file, 'wb') as f:
+                f.write(orjson.dumps(existing_feedbacks, option=orjson.OPT_INDENT_2))
         
         # 로그 기록
-        logging.info(f"피드백 저장 완료: {feedback.tripId} - {feedback.rating}점")
+        logging.info("피드백 저장 완료: %s - %s점", feedback.tripId, feedback.rating)
         
         return {
             "success": True,
@@ -2278,21 +2503,21 @@ async def submit_feedback(feedback: TripFeedback):
         }
         
     except Exception as e:
-        logging.error(f"피드백 저장 오류: {str(e)}")
+        logging.error("피드백 저장 오류: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"피드백 저장 중 오류가 발생했습니다: {str(e)}"
         )
 
 @app.get("/feedback-stats")
-async def get_feedback_stats():
+def get_feedback_stats():
     """피드백 통계를 조회하는 API (관리자용)"""
     try:
         feedback_file = "trip_feedbacks.json"
         
         try:
-            with open(feedback_file, 'r', encoding='utf-8') as f:
-                feedbacks = json.load(f)
+            with open(feedback_file, 'rb') as f:
+                feedbacks = orjson.loads(f.read())
         except FileNotFoundError:
             return {
                 "total_feedbacks": 0,
@@ -2330,7 +2555,7 @@ async def get_feedback_stats():
         }
         
     except Exception as e:
-        logging.error(f"피드백 통계 조회 오류: {str(e)}")
+        logging.error("피드백 통계 조회 오류: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"피드백 통계 조회 중 오류가 발생했습니다: {str(e)}"
@@ -2344,8 +2569,20 @@ async def get_feedback_stats():
 if __name__ == "__main__":
     import uvicorn  # ASGI 서버 (FastAPI를 실행하기 위한 서버)
     
+    # uvloop/httptools가 설치되어 있으면 더 빠른 이벤트 루프와 HTTP 파서를 사용합니다 (Windows는 uvloop 미지원)
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
     print("=== 서버 시작 ===")
-    uvicorn.run(app, host="0.0.0.0", port=8000)  # 모든 IP에서 접근 가능, 8000번 포트 사용
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop, http=http)  # 모든 IP에서 접근 가능, 8000번 포트 사용
 
 
 # ========================================
@@ -2373,14 +2610,14 @@ class TripFeedback(BaseModel):
 async def collect_location_feedback(feedback: LocationFeedback):
     """존재하지 않는 장소에 대한 사용자 피드백을 수집하는 API"""
     try:
-        logger.warning(f"장소 오류 신고: {feedback.location} in {feedback.destination} - 타입: {feedback.feedback_type}")
+        logger.warning("장소 오류 신고: %s in %s - 타입: %s", feedback.location, feedback.destination, feedback.feedback_type)
         
         # 실제 구현에서는 데이터베이스에 저장하거나 관리자에게 알림을 보낼 수 있습니다
         # 현재는 로그로만 기록합니다
         
         return {"success": True, "message": "피드백이 접수되었습니다."}
     except Exception as e:
-        logger.error(f"피드백 수집 오류: {e}")
+        logger.error("피드백 수집 오류: %s", e)
         return {"success": False, "message": "피드백 수집 중 오류가 발생했습니다."}
 
 
@@ -2389,28 +2626,10 @@ async def collect_location_feedback(feedback: LocationFeedback):
 # 채팅을 통한 일정 수정 API 엔드포인트
 # ========================================
 
-@app.post("/modify-trip-chat")
-async def modify_trip_chat(request: ChatModifyRequest):
-    """채팅을 통해 여행 일정을 수정하는 API"""
-    try:
-        logger.info(f"채팅 수정 요청: {request.message}")
-        logger.info(f"현재 여행지: {request.current_trip_plan.get('destination', 'N/A')}")
-        
-        # OpenAI API를 사용하여 수정 요청 처리
-        client = openai.OpenAI(api_key=openai_api_key)
-        
-        # 현재 일정 데이터를 문자열로 변환
-        current_plan_str = json.dumps(request.current_trip_plan, ensure_ascii=False, indent=2)
-        
-        # GPT에게 수정 요청을 처리하도록 하는 프롬프트
-        modify_prompt = f"""
-Here is the current travel plan:
-
-{current_plan_str}
-
-User's modification request: "{request.message}"
+# 채팅 수정용 고정 지침 (요청마다 같은 앞부분이므로 system 메시지로 보내 OpenAI 프롬프트 캐시가 적용되도록 합니다)
+_MODIFY_SYSTEM_PROMPT = """당신은 여행 계획 수정 전문가입니다. 다음 기능들을 정확히 처리할 수 있습니다: 1) 일정 추가 ('일정 늘려줘') 2) 일정 제거 ('○○ 빼줘') 3) 일정 교체 ('○○를 △△로 바꿔줘') 4) 일정 이동 ('A와 B 바꿔줘') 5) 활동 변경 ('더 재미있게 바꿔줘'). 모든 새 장소는 실제 존재하는 관광지여야 하며, 기존 장소와 중복되면 안 됩니다. 코드 블록이나 설명 없이 순수 JSON만 출력하세요.
 
-Please modify the travel plan according to the above request.
+Modify the travel plan according to the user's modification request.
 
 **🌏 LANGUAGE REQUIREMENT:**
 - Write all activity titles and descriptions in Korean language
@@ -2471,84 +2690,107 @@ Please modify the travel plan according to the above request.
 
 **Response example when limits violated**:
 ```json
-{{
+{
     "success": false,
     "message": "Sorry, that day already has maximum 5 activities and cannot add more.",
     "current_activities": 5,
     "max_activities": 5
-}}
+}
 ```
 
 or
 
 ```json
-{{
+{
     "success": false,
     "message": "Sorry, that day must maintain minimum 2 activities and cannot delete.",
     "current_activities": 2,
     "min_activities": 2
-}}
-```
+}
+```"""
+
+# 같은 일정에 같은 수정 요청이 들어오면 GPT 호출 없이 이전 결과를 재사용합니다 (1시간 유지)
+_modify_cache = _TTLCache(maxsize=1024, ttl=60 * 60)
+
+def _modify_cache_key(plan_bytes: bytes, request: ChatModifyRequest) -> str:
+    """직렬화된 현재 일정과 (공백을 정리한) 수정 요청 메시지로 캐시 키를 만듭니다"""
+    digest = hashlib.blake2b(plan_bytes, digest_size=16)
+    digest.update(" ".join(request.message.split()).encode("utf-8"))
+    return digest.hexdigest()
+
+async def _run_modify(request: ChatModifyRequest) -> dict:
+    """채팅 수정 요청을 처리하는 본체"""
+    try:
+        logger.info("채팅 수정 요청: %s", request.message)
+        logger.info("현재 여행지: %s", request.current_trip_plan.get('destination', 'N/A'))
+        
+        # 단순 삭제/맞바꾸기 요청은 GPT 호출 없이 바로 처리
+        local_plan = try_local_modify(request.current_trip_plan, request.message)
+        if local_plan is not None:
+            logger.info("GPT 호출 없이 일정을 직접 수정했습니다")
+            return {
+                "success": True,
+                "modified_plan": local_plan,
+                "message": "일정이 성공적으로 수정되었습니다."
+            }
+        
+        # 현재 일정은 한 번만 직렬화해서 캐시 키와 프롬프트에 함께 사용합니다
+        with _timed("일정 직렬화"):
+            plan_bytes = orjson.dumps(request.current_trip_plan)
+        cache_key = _modify_cache_key(plan_bytes, request)
+        cached_result = _modify_cache.get(cache_key)
+        if cached_result is not None:
+            logger.info("캐시된 일정 수정 결과를 반환합니다")
+            return cached_result
+        
+        # 현재 일정 데이터를 문자열로 변환
+        current_plan_str = plan_bytes.decode()
+        
+        # GPT에게 수정 요청을 처리하도록 하는 프롬프트 (고정 지침은 system 메시지로 분리)
+        modify_prompt = f"""Here is the current travel plan:
+
+{current_plan_str}
+
+User's modification request: "{request.message}"
 """
 
         try:
-            completion = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "당신은 여행 계획 수정 전문가입니다. 다음 기능들을 정확히 처리할 수 있습니다: 1) 일정 추가 ('일정 늘려줘') 2) 일정 제거 ('○○ 빼줘') 3) 일정 교체 ('○○를 △△로 바꿔줘') 4) 일정 이동 ('A와 B 바꿔줘') 5) 활동 변경 ('더 재미있게 바꿔줘'). 모든 새 장소는 실제 존재하는 관광지여야 하며, 기존 장소와 중복되면 안 됩니다. 코드 블록이나 설명 없이 순수 JSON만 출력하세요."},
-                    {"role": "user", "content": modify_prompt}
-                ],
-                max_tokens=3000,
-                temperature=0.7
-            )
+            with _timed("OpenAI 호출"):
+                completion = await client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {"role": "system", "content": _MODIFY_SYSTEM_PROMPT},
+                        {"role": "user", "content": modify_prompt}
+                    ],
+                    max_tokens=3000,
+                    temperature=0.7,
+                    response_format={"type": "json_object"}  # 코드 블록 없이 순수 JSON 객체만 응답하도록 강제
+                )
             
             response_content = completion.choices[0].message.content.strip()
-            logger.info(f"OpenAI 응답 (처음 200자): {response_content[:200]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("OpenAI 응답 (처음 200자): %s...", response_content[:200])
             
-            # JSON 파싱 시도 (더 강력한 정리)
+            # JSON 파싱 시도 (코드 블록이나 설명 문구가 섞여 있어도 가장 바깥 JSON 객체만 파싱)
             try:
-                # 다양한 형태의 코드 블록 제거
-                content = response_content.strip()
-                
-                # ```json이나 ``` 코드 블록 제거
-                if content.startswith('```'):
-                    lines = content.split('\n')
-                    # 첫 번째 ```가 있는 줄 제거
-                    if lines[0].strip() in ['```', '```json']:
-                        lines = lines[1:]
-                    # 마지막 ```가 있는 줄 제거
-                    if lines and lines[-1].strip() == '```':
-                        lines = lines[:-1]
-                    content = '\n'.join(lines)
-                
-                # 앞뒤 공백과 개행 제거
-                content = content.strip()
+                with _timed("JSON 추출"):
+                    modified_plan = _parse_json_object(response_content)
+                if modified_plan is None:
+                    raise json.JSONDecodeError("JSON 객체를 찾을 수 없습니다", response_content, 0)
                 
-                # 추가 정리: 맨 앞뒤에 있는 불필요한 텍스트 제거
-                if content.startswith('"') and content.endswith('"'):
-                    content = content[1:-1]
-                
-                # 첫 번째 {부터 마지막 }까지만 추출
-                start_idx = content.find('{')
-                end_idx = content.rfind('}')
-                if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
-                    content = content[start_idx:end_idx+1]
-                
-                logger.info(f"정리된 JSON (처음 200자): {content[:200]}...")
-                
-                # JSON 파싱
-                modified_plan = json.loads(content)
-                
-                return {
+                result = {
                     "success": True,
                     "modified_plan": modified_plan,
                     "message": "일정이 성공적으로 수정되었습니다."
                 }
+                _modify_cache.set(cache_key, result)
+                return result
                 
             except json.JSONDecodeError as e:
-                logger.error(f"JSON 파싱 오류: {e}")
-                logger.error(f"원본 응답: {response_content}")
-                logger.error(f"정리된 내용: {content}")
+                logger.error("JSON 파싱 오류: %s", e)
+                # 원본 응답 전체 대신 앞부분과 해시만 남깁니다 (로그 크기 제한)
+                logger.error("원본 응답 (처음 500자, sha1=%s): %s",
+                             hashlib.sha1(response_content.encode("utf-8")).hexdigest(), response_content[:500])
                 
                 # JSON 파싱 실패시 더 상세한 안내 제공
                 return {
@@ -2558,15 +2800,23 @@ or
                 }
                 
         except Exception as openai_error:
-            logger.error(f"OpenAI API 오류: {openai_error}")
+            logger.error("OpenAI API 오류: %s", openai_error)
             return {
                 "success": False,
                 "message": "일정 수정 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
             }
             
     except Exception as e:
-        logger.error(f"채팅 수정 처리 중 오류: {e}")
+        logger.error("채팅 수정 처리 중 오류: %s", e)
         return {
             "success": False,
             "message": "요청 처리 중 오류가 발생했습니다."
-        }
\ No newline at end of file
+        }
+
+@app.post("/modify-trip-chat")
+async def modify_trip_chat(request: ChatModifyRequest):
+    """채팅을 통해 여행 일정을 수정하는 API"""
+    result = await _run_modify(request)
+    # 결과는 이미 JSON 호환 dict이므로 jsonable_encoder 변환 없이 바로 orjson으로 직렬화합니다
+    with _timed("응답 생성"):
+        return ORJSONResponse(result)
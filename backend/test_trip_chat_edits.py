@@ -0,0 +1,145 @@
+"""
+채팅 일정 수정 로컬 처리 테스트 스크립트
+
+GPT 없이 처리하는 활동 삭제/일정 맞바꾸기 요청이 올바르게 적용되고,
+애매하거나 해석할 수 없는 요청은 None을 반환해 GPT로 넘어가는지 확인합니다.
+"""
+
+import copy
+import sys
+from trip_chat_edits import try_local_modify
+
+def make_plan():
+    """테스트용 3일 일정 (2일차는 최소 활동 수만 남아 있음)"""
+    return {
+        "destination": "부산",
+        "itinerary": [
+            {"day": 1, "date": "2025-01-01", "activities": [
+                {"time": "09:00", "title": "해운대 산책", "location": "해운대해수욕장"},
+                {"time": "12:00", "title": "점심 식사", "location": "국밥거리"},
+                {"time": "15:00", "title": "발 마사지", "location": "서면"},
+            ]},
+            {"day": 2, "date": "2025-01-02", "activities": [
+                {"time": "10:00", "title": "감천문화마을 구경", "location": "감천문화마을"},
+                {"time": "14:00", "title": "자갈치시장 투어", "location": "자갈치시장"},
+            ]},
+            {"day": 3, "date": "2025-01-03", "activities": [
+                {"time": "09:00", "title": "점심 식사 전 카페", "location": "전포카페거리"},
+                {"time": "12:00", "title": "점심 식사", "location": "광안리"},
+                {"time": "16:00", "title": "광안대교 야경", "location": "광안리해수욕장"},
+            ]},
+        ],
+    }
+
+def titles(plan, day_idx):
+    return [activity["title"] for activity in plan["itinerary"][day_idx]["activities"]]
+
+# ========================================
+# 활동 삭제
+# ========================================
+
+def test_remove_korean():
+    for message in ["1일차 마사지 빼줘", "1일차 마사지를 빼줘", "1일차에서 발 마사지 삭제해 주세요", "1일차의 마사지 제거해줘!"]:
+        result = try_local_modify(make_plan(), message)
+        assert result is not None, message
+        assert titles(result, 0) == ["해운대 산책", "점심 식사"], message
+
+def test_remove_english():
+    plan = make_plan()
+    plan["itinerary"][0]["activities"][2]["title"] = "Foot Massage"
+    result = try_local_modify(plan, "Remove the massage from day 1.")
+    assert result is not None
+    assert titles(result, 0) == ["해운대 산책", "점심 식사"]
+
+def test_remove_keeps_other_days_and_input():
+    plan = make_plan()
+    original = copy.deepcopy(plan)
+    result = try_local_modify(plan, "1일차 마사지 빼줘")
+    assert plan == original  # 원본 일정은 바꾸지 않음
+    assert result["itinerary"][1:] == original["itinerary"][1:]
+    assert result["destination"] == "부산"
+
+def test_remove_ambiguous_target_falls_through():
+    # 3일차에는 '점심 식사'가 들어간 활동이 두 개 → 어느 것을 뺄지 모르므로 GPT로 넘김
+    assert try_local_modify(make_plan(), "3일차 점심 식사 빼줘") is None
+
+def test_remove_unknown_target_falls_through():
+    assert try_local_modify(make_plan(), "1일차 스카이캡슐 빼줘") is None
+    assert try_local_modify(make_plan(), "1일차 오후 일정 빼줘") is None
+
+def test_remove_minimum_activities_falls_through():
+    # 2일차는 활동이 2개뿐이라 삭제 제한 안내를 GPT가 하도록 넘김
+    assert try_local_modify(make_plan(), "2일차 자갈치시장 빼줘") is None
+
+def test_remove_unknown_day_falls_through():
+    assert try_local_modify(make_plan(), "5일차 마사지 빼줘") is None
+    assert try_local_modify(make_plan(), "remove massage from day 9") is None
+
+def test_remove_target_across_fields_falls_through():
+    # 제목 끝('마사지')과 장소 앞('서면')을 이어 붙인 문자열은 활동 이름이 아님
+    assert try_local_modify(make_plan(), "1일차 마사지서면 빼줘") is None
+
+def test_remove_numeric_target_is_not_a_day():
+    # 'remove 10 from day 1'의 10은 날짜가 아니라 삭제 대상
+    plan = make_plan()
+    plan["itinerary"][0]["activities"][0]["title"] = "10시 브런치"
+    result = try_local_modify(plan, "remove 10 from day 1")
+    assert result is not None
+    assert titles(result, 0) == ["점심 식사", "발 마사지"]
+
+def test_non_remove_requests_fall_through():
+    for message in [
+        "1일차 마사지 빼지 마",
+        "1일차 마사지 빼고 카페 추가해줘",
+        "1일차 마사지를 해운대 산책으로 바꿔줘",
+        "1일차 더 재미있게 바꿔줘",
+        "일정 늘려줘",
+    ]:
+        assert try_local_modify(make_plan(), message) is None, message
+
+# ========================================
+# 날짜 간 일정 맞바꾸기
+# ========================================
+
+def test_swap_korean_and_english():
+    for message in ["1일차와 3일차 바꿔줘", "1일차랑 3일차 일정을 서로 바꿔 주세요", "swap day 1 and day 3"]:
+        plan = make_plan()
+        result = try_local_modify(plan, message)
+        assert result is not None, message
+        assert titles(result, 0) == titles(plan, 2), message
+        assert titles(result, 2) == titles(plan, 0), message
+        # 날짜 정보는 그대로 유지
+        assert [day["date"] for day in result["itinerary"]] == ["2025-01-01", "2025-01-02", "2025-01-03"]
+
+def test_swap_invalid_days_fall_through():
+    assert try_local_modify(make_plan(), "1일차와 1일차 바꿔줘") is None
+    assert try_local_modify(make_plan(), "1일차와 7일차 바꿔줘") is None
+    assert try_local_modify(make_plan(), "swap day 2 with day 8") is None
+
+def test_partial_swap_requests_fall_through():
+    for message in ["1일차 마사지를 3일차로 바꿔줘", "1일차와 3일차 점심을 바꿔줘", "1일차 3일차로 바꿔줘"]:
+        assert try_local_modify(make_plan(), message) is None, message
+
+def test_plan_without_itinerary_falls_through():
+    assert try_local_modify({"destination": "부산"}, "1일차 마사지 빼줘") is None
+    assert try_local_modify({"itinerary": None}, "swap day 1 and day 2") is None
+
+def main():
+    """모든 테스트를 실행하고 결과를 출력합니다"""
+    print("=== 채팅 일정 수정 로컬 처리 테스트 ===\n")
+
+    tests = [(name, func) for name, func in globals().items() if name.startswith("test_") and callable(func)]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name}: {e}")
+
+    print(f"\n🎯 {len(tests) - failed}/{len(tests)}개 테스트 통과")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,88 @@
+"""
+채팅 일정 수정 로컬 처리
+
+활동 삭제, 날짜 간 일정 맞바꾸기처럼 결과가 정해진 단순 수정 요청을 GPT 호출 없이 직접 처리합니다.
+요청을 확실히 해석할 수 없으면 아무것도 바꾸지 않고 None을 반환해 GPT가 처리하도록 넘깁니다.
+"""
+
+import re
+from typing import Optional
+
+# GPT 없이 바로 처리할 수 있는 단순 수정 요청 패턴 (한국어 + 영어)
+# 예: "2일차 마사지 빼줘", "remove massage from day 2", "1일차와 3일차 바꿔줘", "swap day 1 and day 3"
+_REMOVE_PATTERNS = (
+    re.compile(r'^(?P<day>\d+)\s*일\s*차\s*(?:에서|의|에)?\s*(?P<target>.+?)\s*(?:을|를)?\s*(?:빼|삭제|제거)\s*(?:해)?\s*(?:줘|주세요|줘요)?$'),
+    re.compile(r'^(?:remove|delete)\s+(?:the\s+)?(?P<target>.+?)\s+(?:from|on|in)\s+day\s*(?P<day>\d+)$', re.IGNORECASE),
+)
+_SWAP_PATTERNS = (
+    re.compile(r'^(\d+)\s*일\s*차\s*(?:와|과|랑|하고|,)?\s*(\d+)\s*일\s*차\s*(?:일정\s*)?(?:을|를)?\s*(?:서로\s*)?(?:바꿔|교체|맞바꿔)\s*(?:해)?\s*(?:줘|주세요|줘요)?$'),
+    re.compile(r'^swap\s+day\s*(\d+)\s*(?:and|with|&|<->|↔)\s*day\s*(\d+)$', re.IGNORECASE),
+)
+_MIN_ACTIVITIES = 2  # 하루 최소 활동 수 (수정 프롬프트의 삭제 제한과 동일)
+
+def _find_day_index(itinerary: list, day_number: str) -> Optional[int]:
+    """일정표에서 day 값이 day_number인 날의 인덱스를 찾습니다"""
+    for idx, day in enumerate(itinerary):
+        if isinstance(day, dict) and str(day.get("day")) == day_number:
+            return idx
+    return None
+
+def _activity_text(activity: dict) -> str:
+    """활동의 제목과 장소를 공백 없이 소문자로 합칩니다 (구분자로 두 필드에 걸친 오매칭 방지)"""
+    return "".join(f"{activity.get('title', '')}\x01{activity.get('location', '')}".split()).lower()
+
+def try_local_modify(plan: dict, message: str) -> Optional[dict]:
+    """
+    활동 삭제, 날짜 간 일정 맞바꾸기처럼 결과가 정해진 수정 요청을 GPT 없이 직접 처리합니다.
+
+    Args:
+        plan: 현재 여행 계획 (수정하지 않음)
+        message: 사용자의 수정 요청 메시지
+
+    Returns:
+        수정된 일정 (요청을 확실히 해석할 수 없거나 제한에 걸리면 None → GPT로 처리)
+    """
+    itinerary = plan.get("itinerary")
+    if not isinstance(itinerary, list):
+        return None
+    text = message.strip().rstrip(".!?~ ")
+
+    # 1) 특정 날짜의 활동 삭제
+    for pattern in _REMOVE_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        target_key = "".join(match.group("target").split()).lower()
+        day_idx = _find_day_index(itinerary, match.group("day"))
+        if day_idx is None or len(target_key) < 2:
+            return None
+
+        activities = itinerary[day_idx].get("activities") or []
+        matched = [activity for activity in activities if target_key in _activity_text(activity)]
+        # 대상이 하나로 정해지지 않거나 최소 활동 수 제한에 걸리면 GPT가 판단하도록 넘깁니다
+        if len(matched) != 1 or len(activities) <= _MIN_ACTIVITIES:
+            return None
+
+        new_itinerary = list(itinerary)
+        new_itinerary[day_idx] = {
+            **itinerary[day_idx],
+            "activities": [activity for activity in activities if activity is not matched[0]]
+        }
+        return {**plan, "itinerary": new_itinerary}
+
+    # 2) 두 날짜의 일정 맞바꾸기 (날짜 정보는 그대로 두고 활동만 교환)
+    for pattern in _SWAP_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        first_idx = _find_day_index(itinerary, match.group(1))
+        second_idx = _find_day_index(itinerary, match.group(2))
+        if first_idx is None or second_idx is None or first_idx == second_idx:
+            return None
+
+        new_itinerary = list(itinerary)
+        new_itinerary[first_idx] = {**itinerary[first_idx], "activities": itinerary[second_idx].get("activities", [])}
+        new_itinerary[second_idx] = {**itinerary[second_idx], "activities": itinerary[first_idx].get("activities", [])}
+        return {**plan, "itinerary": new_itinerary}
+
+    return None
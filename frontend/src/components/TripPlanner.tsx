@@ -311,24 +311,28 @@ const TripPlanner: React.FC<TripPlannerProps> = ({ onTripGenerated, loading, set
         ? 'https://planner-backend-3bcz.onrender.com'
         : 'http://localhost:8000';
       
-      const progressUrl = `${baseUrl}/plan-trip-progress?destination=${encodeURIComponent(submitData.destination)}&start_date=${submitData.start_date}&end_date=${submitData.end_date}&budget=${encodeURIComponent(submitData.budget)}&guests=${submitData.guests}&rooms=${submitData.rooms}`;
+      const progressParams = new URLSearchParams({
+        destination: submitData.destination,
+        start_date: submitData.start_date,
+        end_date: submitData.end_date,
+        budget: submitData.budget,
+        guests: String(submitData.guests),
+        rooms: String(submitData.rooms),
+        companionType: submitData.companionType,
+        travelStyle: submitData.travelStyle,
+        travelPace: submitData.travelPace
+      });
+      submitData.interests.forEach((interest: string) => progressParams.append('interests', interest));
+      const progressUrl = `${baseUrl}/plan-trip-progress?${progressParams.toString()}`;
       const planUrl = `${baseUrl}/plan-trip`;
       
       console.log('전송할 데이터:', submitData);
       console.log('Progress URL:', progressUrl);
       console.log('Plan URL:', planUrl);
       
-      // SSE로 진행 상황 받기
+      // SSE로 진행 상황과 최종 여행 계획을 함께 받기
       const eventSource = new EventSource(progressUrl);
       
-      // 13초 후에 자동으로 실제 API 호출 시작 (SSE가 끊어져도 진행)
-      const progressTimeout = setTimeout(() => {
-        eventSource.close();
-        setProgressMessage('AI가 여행 계획을 생성하고 있습니다...');
-        setProgressPercent(90);
-        generateTripPlan(submitData, planUrl);
-      }, 13000);
-      
       eventSource.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data);
@@ -336,28 +340,22 @@ const TripPlanner: React.FC<TripPlannerProps> = ({ onTripGenerated, loading, set
           if (data.step) {
             setProgressMessage(data.message);
             setProgressPercent(data.progress);
-            
-            // 90%에 도달하면 실제 API 호출 시작
-            if (data.progress >= 90) {
-              clearTimeout(progressTimeout);
-              eventSource.close();
-              // 90% 진행 후 실제 여행 계획 생성 시작
-              setTimeout(() => {
-                generateTripPlan(submitData, planUrl);
-              }, 500); // 0.5초 후 API 호출 시작
-            }
           }
           
-          if (data.completed) {
-            clearTimeout(progressTimeout);
+          // AI 응답 조각이 도착하기 시작하면 실제 생성 단계로 표시
+          if (data.delta) {
+            setProgressMessage('🤖 AI가 여행 계획을 작성하고 있습니다...');
+          }
+          
+          if (data.completed && data.result) {
             eventSource.close();
-            // 진행 상황이 완료되면 실제 여행 계획 요청
-            setProgressMessage('AI가 여행 계획을 생성하고 있습니다...');
-            generateTripPlan(submitData, planUrl);
+            // 서버에서 생성된 여행 계획을 그대로 사용
+            completeTripPlan(submitData, data.result)
+              .catch((error) => console.error('여행 계획 완료 처리 오류:', error))
+              .finally(() => setLoading(false));
           }
           
           if (data.error) {
-            clearTimeout(progressTimeout);
             eventSource.close();
             console.error('Progress error:', data.error);
             setLoading(false);
@@ -370,9 +368,8 @@ const TripPlanner: React.FC<TripPlannerProps> = ({ onTripGenerated, loading, set
 
       eventSource.onerror = (error) => {
         console.error('EventSource error:', error);
-        clearTimeout(progressTimeout);
         eventSource.close();
-        // 진행 상황 실패 시에도 여행 계획은 생성 시도
+        // 진행 상황 연결 실패 시에는 일반 API로 여행 계획 생성 시도
         setProgressMessage('진행 상황 연결이 끊어졌습니다. 여행 계획을 계속 생성합니다...');
         setProgressPercent(90);
         generateTripPlan(submitData, planUrl);
@@ -385,6 +382,36 @@ const TripPlanner: React.FC<TripPlannerProps> = ({ onTripGenerated, loading, set
     }
   };
 
+  const completeTripPlan = async (submitData: any, tripPlan: TripPlan) => {
+    // 99% → 100%로 마무리
+    setProgressMessage('🎉 여행 계획이 완성되었습니다!');
+    setProgressPercent(99);
+    
+    await new Promise(resolve => setTimeout(resolve, 300));
+    setProgressPercent(100);
+    
+    // 잠시 100% 상태를 보여준 후 완료
+    await new Promise(resolve => setTimeout(resolve, 1000));
+    
+    // 여행 계획 생성 성공 시 플래너 데이터 삭제
+    sessionStorage.removeItem('tripPlannerFormData');
+    sessionStorage.removeItem('tripPlannerCurrentStep');
+    console.log('Cleared trip planner data after successful generation');
+    
+    // GA4 이벤트 추적 - 여행 계획 완료
+    const destination = submitData.destination;
+    const startDate = new Date(submitData.start_date);
+    const endDate = new Date(submitData.end_date);
+    const duration = Math.ceil((endDate.getTime() - startDate.getTime()) / (1000 * 60 * 60 * 24));
+    const totalPlaces = tripPlan.itinerary?.reduce((total: number, day: any) => {
+      return total + (day.activities?.length || 0);
+    }, 0) || 0;
+    
+    analyticsEvents.tripPlanningCompleted(destination, duration, totalPlaces);
+    
+    onTripGenerated(tripPlan);
+  };
+
   const generateTripPlan = async (submitData: any, planUrl: string) => {
     let progressInterval: NodeJS.Timeout | null = null;
     
@@ -415,33 +442,7 @@ const TripPlanner: React.FC<TripPlannerProps> = ({ onTripGenerated, loading, set
         progressInterval = null;
       }
       
-      // 99% → 100%로 마무리
-      setProgressMessage('🎉 여행 계획이 완성되었습니다!');
-      setProgressPercent(99);
-      
-      await new Promise(resolve => setTimeout(resolve, 300));
-      setProgressPercent(100);
-      
-      // 잠시 100% 상태를 보여준 후 완료
-      await new Promise(resolve => setTimeout(resolve, 1000));
-      
-      // 여행 계획 생성 성공 시 플래너 데이터 삭제
-      sessionStorage.removeItem('tripPlannerFormData');
-      sessionStorage.removeItem('tripPlannerCurrentStep');
-      console.log('Cleared trip planner data after successful generation');
-      
-      // GA4 이벤트 추적 - 여행 계획 완료
-      const destination = submitData.destination;
-      const startDate = new Date(submitData.start_date);
-      const endDate = new Date(submitData.end_date);
-      const duration = Math.ceil((endDate.getTime() - startDate.getTime()) / (1000 * 60 * 60 * 24));
-      const totalPlaces = response.data.itinerary?.reduce((total: number, day: any) => {
-        return total + (day.activities?.length || 0);
-      }, 0) || 0;
-      
-      analyticsEvents.tripPlanningCompleted(destination, duration, totalPlaces);
-      
-      onTripGenerated(response.data);
+      await completeTripPlan(submitData, response.data);
     } catch (error: any) {
       console.error('여행 계획 생성 오류:', error);
       